@@ -8,7 +8,7 @@ from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
     QPushButton, QLabel, QInputDialog, QMessageBox, QAbstractItemView
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QSize
+from PyQt5.QtCore import Qt, pyqtSignal, QSize, QFileSystemWatcher, QTimer
 from PyQt5.QtGui import QIcon, QFont, QPixmap
 
 from ..utils.conversation import ConversationManager
@@ -32,7 +32,22 @@ class ConversationDialog(QDialog):
         self.setWindowTitle("CONVERSATION HISTORY")
         self.setMinimumSize(600, 500)
         self.setup_ui()
+        
+        # Pick up files changed while the dialog was closed before listing
+        try:
+            self.conversation_manager.sync_index()
+        except Exception as e:
+            print(f"Error syncing conversations: {e}")
         self.load_conversations()
+        
+        # Refresh the list when conversations change on disk while the dialog
+        # is open; bursts of directory events are coalesced into one sync
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(200)
+        self._sync_timer.timeout.connect(self._sync_conversations)
+        self._watcher = QFileSystemWatcher([str(conversation_manager.save_dir)], self)
+        self._watcher.directoryChanged.connect(self._sync_timer.start)
     
     def setup_ui(self):
         """Initialize the user interface."""
@@ -221,6 +236,14 @@ class ConversationDialog(QDialog):
             item.setTextAlignment(Qt.AlignCenter)
             self.conversation_list.addItem(item)
     
+    def _sync_conversations(self):
+        """Reload the list if files were added or removed outside the app."""
+        try:
+            if self.conversation_manager.sync_index():
+                self.load_conversations()
+        except Exception as e:
+            print(f"Error syncing conversations: {e}")
+    
     def on_selection_changed(self):
         """Handle conversation selection change."""
         selected = self.conversation_list.selectedItems()
@@ -2,6 +2,7 @@
 File upload widget with drag and drop support and file analysis capabilities.
 """
 import os
+import sys
 import time
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Callable
@@ -25,6 +26,9 @@ from PyQt5.QtGui import QDragEnterEvent, QDropEvent, QIcon, QPixmap, QFont, QCol
 
 from ..utils.file_analyzer import FileAnalyzer
 
+# Extensions whose parsing is CPU-bound enough to need worker processes
+CPU_BOUND_EXTENSIONS = frozenset({'.pdf', '.xlsx', '.xls'})
+
 
 class FileProcessor(QObject):
     """Worker class for processing files in a separate thread."""
@@ -33,13 +37,20 @@ class FileProcessor(QObject):
     finished = pyqtSignal()
     error_occurred = pyqtSignal(str)         # error_message
     
+    # Files analyzed concurrently between progress updates
+    BATCH_SIZE = os.cpu_count() or 4
+    
     def __init__(self):
         super().__init__()
         self._is_running = False
         self._current_file = None
     
     def process_files(self, file_paths):
-        """Process a list of files asynchronously."""
+        """Process a list of files asynchronously.
+        
+        Files are analyzed concurrently in batches, so progress is reported
+        and a stop request is honoured between batches.
+        """
         if self._is_running:
             return
             
@@ -47,20 +58,32 @@ class FileProcessor(QObject):
         total_files = len(file_paths)
         
         try:
-            for i, file_path in enumerate(file_paths, 1):
+            for start in range(0, total_files, self.BATCH_SIZE):
                 if not self._is_running:
                     break
                     
-                self._current_file = file_path
-                progress = int((i / total_files) * 100)
-                self.progress_updated.emit(progress, f"Analyzing {os.path.basename(file_path)}...")
+                batch = file_paths[start:start + self.BATCH_SIZE]
+                self._current_file = batch[0]
+                progress = int((start / total_files) * 100)
+                if len(batch) == 1:
+                    status = f"Analyzing {os.path.basename(batch[0])}..."
+                else:
+                    status = f"Analyzing files {start + 1}-{start + len(batch)} of {total_files}..."
+                self.progress_updated.emit(progress, status)
                 
                 try:
-                    # Analyze the file
-                    analysis = FileAnalyzer.analyze_file(file_path)
-                    self.file_processed.emit(file_path, analysis)
-                except Exception as e:
-                    self.error_occurred.emit(f"Error analyzing {os.path.basename(file_path)}: {str(e)}")
+                    analyses = FileAnalyzer.analyze_files(batch, mode=self._analysis_mode(batch))
+                except Exception:
+                    # One file failed outright; analyze the batch one at a
+                    # time to tell which
+                    analyses = None
+                
+                for i, file_path in enumerate(batch):
+                    try:
+                        analysis = analyses[i] if analyses is not None else FileAnalyzer.analyze_file(file_path)
+                        self.file_processed.emit(file_path, analysis)
+                    except Exception as e:
+                        self.error_occurred.emit(f"Error analyzing {os.path.basename(file_path)}: {str(e)}")
                 
                 # Small delay to prevent UI freezing
                 QThread.msleep(100)
@@ -72,6 +95,20 @@ class FileProcessor(QObject):
             self._current_file = None
             self.finished.emit()
     
+    @staticmethod
+    def _analysis_mode(file_paths):
+        """Use worker processes for batches with PDF or Excel files.
+        
+        Parsing those is CPU-bound Python that holds the GIL, so threads would
+        not run it in parallel. A frozen build stays on threads, since its
+        worker processes would re-run the executable.
+        """
+        if getattr(sys, 'frozen', False):
+            return 'io'
+        if any(Path(p).suffix.lower() in CPU_BOUND_EXTENSIONS for p in file_paths):
+            return 'cpu'
+        return 'io'
+    
     def stop_processing(self):
         """Stop the current processing operation."""
         self._is_running = False
@@ -55,7 +55,7 @@ class PromptLibraryDialog(QDialog):
         items = self.prompt_list.selectedItems()
         if items:
             name = items[0].text()
-            prompt = next((p for p in self.library.get_prompts() if p["name"] == name), None)
+            prompt = self.library.get_prompt(name)
             if prompt:
                 self.selected_prompt = prompt
                 self.prompt_text.setPlainText(prompt["text"])
@@ -83,7 +83,9 @@ class PromptLibraryDialog(QDialog):
         old_name = self.selected_prompt["name"]
         new_name, ok = QInputDialog.getText(self, "Rename Prompt", "New name:", text=old_name)
         if ok and new_name and new_name != old_name:
-            self.library.rename_prompt(old_name, new_name)
+            if not self.library.rename_prompt(old_name, new_name):
+                QMessageBox.warning(self, "Rename Prompt", f"A prompt named '{new_name}' already exists.")
+                return
             self.load_prompts()
 
     def delete_prompt(self):
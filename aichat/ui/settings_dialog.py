@@ -30,7 +30,7 @@ from aichat.i18n import (
     SUPPORTED_LANGUAGES
 )
 
-from PyQt5.QtCore import QSize, Qt, pyqtSignal, pyqtSlot
+from PyQt5.QtCore import QMargins, QSize, Qt, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import QColor, QFont, QIcon, QPalette
 from PyQt5.QtWidgets import (
     QCheckBox,
@@ -69,6 +69,74 @@ FontSize = int
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Rules shared by every ColorButton, matched by class name from the dialog
+# stylesheet instead of being parsed once per button.
+COLOR_BUTTON_STYLESHEET = """
+    ColorButton {
+        border: 1px solid #444;
+        border-radius: 3px;
+    }
+    ColorButton:hover {
+        border: 2px solid #00f0ff;
+        margin: -1px;
+    }
+    ColorButton:pressed {
+        margin: 1px -1px -1px 1px;
+    }
+"""
+
+# Complete per-theme stylesheets for the settings dialog. Each one is applied
+# to the dialog in a single setStyleSheet() call and cascades to all children.
+DIALOG_STYLESHEETS: Dict[str, str] = {
+    "dark": COLOR_BUTTON_STYLESHEET + """
+        QDialog { background-color: #1e1e2e; color: #cdd6f4; }
+        QLabel { color: #cdd6f4; }
+        QGroupBox::title { color: #89b4fa; }
+        #theme_preview {
+            background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #1e1e2e, stop:1 #181825);
+            border: 1px solid #313244;
+            border-radius: 6px;
+        }
+    """,
+    "light": COLOR_BUTTON_STYLESHEET + """
+        QDialog { background-color: #f5f5f5; color: #333333; }
+        QLabel { color: #333333; }
+        QGroupBox::title { color: #1e66f5; }
+        #theme_preview {
+            background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #f5f5f5, stop:1 #e6e6e6);
+            border: 1px solid #d4d4d4;
+            border-radius: 6px;
+        }
+    """,
+}
+
+# Layout margins shared by the settings tabs
+TAB_MARGINS = QMargins(5, 5, 5, 5)
+WIDE_TAB_MARGINS = QMargins(20, 20, 20, 20)
+
+
+def _tab_layout(
+    tab: QWidget,
+    margins: QMargins = TAB_MARGINS,
+    spacing: Optional[int] = None,
+) -> QVBoxLayout:
+    """Create a preconfigured vertical layout for a settings tab.
+    
+    Args:
+        tab: Widget that receives the layout.
+        margins: Contents margins to apply.
+        spacing: Spacing between items, or None for the style default.
+        
+    Returns:
+        QVBoxLayout: The configured layout installed on the tab.
+    """
+    layout = QVBoxLayout(tab)
+    layout.setContentsMargins(margins)
+    if spacing is not None:
+        layout.setSpacing(spacing)
+    return layout
+
+
 class ProfileManagerWidget(QWidget):
     """A widget for managing AI profiles."""
     def __init__(self, memory_manager: 'MemoryManager', parent: Optional[QWidget] = None) -> None:
@@ -179,20 +247,9 @@ class ColorButton(QPushButton):
     
     def _update_style(self) -> None:
         """Update the button's style based on the current color."""
-        self.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {self._color};
-                border: 1px solid #444;
-                border-radius: 3px;
-            }}
-            QPushButton:hover {{
-                border: 2px solid #00f0ff;
-                margin: -1px;
-            }}
-            QPushButton:pressed {{
-                margin: 1px -1px -1px 1px;
-            }}
-        """)
+        # Border, hover and pressed rules are shared by every ColorButton and
+        # come from the dialog stylesheet; only the swatch color is per button.
+        self.setStyleSheet(f"background-color: {self._color};")
     
     def color(self) -> ColorHex:
         """Get the current color.
@@ -305,28 +362,38 @@ class SettingsDialog(QDialog):
             )
         
         self.memory_manager = memory_manager
-        
+
+        # Settings collected from the widgets, or None when a widget changed
+        self._settings_cache: Optional[Dict[str, Any]] = None
+
+        # Dialog stylesheet currently applied, tracked on the Python side
+        self._applied_stylesheet: Optional[str] = None
+
+        # Defer painting and relayout until the whole widget tree is built
+        self.setUpdatesEnabled(False)
         try:
             # Load current preferences
             self.preferences = memory_manager.preferences
-            
+
             # Initialize UI components
             self._init_ui()
-            
+
             # Load current settings into the UI
             self.load_settings()
-            
+
             # Apply the current theme
             self.apply_theme(self.preferences.theme)
-            
+
             # Connect signals after UI is initialized
             self._connect_signals()
-            
+
         except Exception as e:
             logger.exception("Failed to initialize settings dialog")
             raise RuntimeError(
                 "Failed to initialize settings dialog. See logs for details."
             ) from e
+        finally:
+            self.setUpdatesEnabled(True)
     
     def _init_ui(self) -> None:
         """Initialize the user interface components."""
@@ -346,7 +413,11 @@ class SettingsDialog(QDialog):
         self.tab_widget.addTab(self._create_chat_tab(), "Chat")
         self.tab_widget.addTab(self._create_ai_tab(), "AI")
         self.tab_widget.addTab(self._create_privacy_tab(), "Privacy")
-        self.tab_widget.addTab(self._create_profiles_tab(), "Profiles")
+        # The profiles tab is not part of load/save, so it is built on first view
+        self.profiles_tab = QWidget()
+        self.profile_manager: Optional[ProfileManagerWidget] = None
+        self.tab_widget.addTab(self.profiles_tab, "Profiles")
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
         
         # Add tabs to main layout
         main_layout.addWidget(self.tab_widget)
@@ -369,6 +440,37 @@ class SettingsDialog(QDialog):
             font_family_combo.currentFontChanged.connect(self._on_font_changed)
         if font_size_spin:
             font_size_spin.valueChanged.connect(self._on_font_changed)
+
+        # Invalidate the cached settings whenever an input changes
+        for widget in self._input_widgets():
+            if isinstance(widget, QCheckBox):
+                widget.toggled.connect(self._mark_dirty)
+            elif isinstance(widget, QFontComboBox):
+                widget.currentFontChanged.connect(self._mark_dirty)
+            elif isinstance(widget, QComboBox):
+                widget.currentIndexChanged.connect(self._mark_dirty)
+            elif isinstance(widget, ColorButton):
+                widget.color_changed.connect(self._mark_dirty)
+            else:
+                widget.valueChanged.connect(self._mark_dirty)
+
+    def _input_widgets(self) -> Tuple[QWidget, ...]:
+        """Return every widget whose value is part of the saved settings."""
+        return (
+            self.language_combo, self.rtl_checkbox, self.theme_combo,
+            self.accent_color_btn, self.font_family_combo, self.font_size_spin,
+            self.show_timestamps_cb, self.show_typing_cb, self.markdown_rendering_cb,
+            self.link_preview_cb, self.emoji_picker_cb, self.history_limit_spin,
+            self.auto_clear_cb, self.model_combo, self.temperature_slider,
+            self.max_tokens_spin, self.context_window_cb, self.memory_enabled_cb,
+            self.memory_summary_cb, self.analytics_cb, self.crash_reports_cb,
+            self.typing_analytics_cb,
+        )
+
+    @pyqtSlot()
+    def _mark_dirty(self) -> None:
+        """Invalidate the cached settings after a widget value changed."""
+        self._settings_cache = None
     
     def _add_dialog_buttons(self, layout: QVBoxLayout) -> None:
         """Add dialog buttons to the layout.
@@ -408,8 +510,7 @@ class SettingsDialog(QDialog):
             QWidget: The configured appearance tab widget.
         """
         tab = QWidget()
-        layout = QVBoxLayout(tab)
-        layout.setContentsMargins(5, 5, 5, 5)
+        layout = _tab_layout(tab)
         
         # Language settings
         lang_group = QGroupBox(tr("settings.language_group", default="Language & Region"))
@@ -493,8 +594,7 @@ class SettingsDialog(QDialog):
             QWidget: The configured chat settings tab widget.
         """
         tab = QWidget()
-        layout = QVBoxLayout(tab)
-        layout.setContentsMargins(5, 5, 5, 5)
+        layout = _tab_layout(tab)
         
         # Display settings
         display_group = QGroupBox("Display")
@@ -547,8 +647,7 @@ class SettingsDialog(QDialog):
             QWidget: The configured AI settings tab widget.
         """
         tab = QWidget()
-        layout = QVBoxLayout(tab)
-        layout.setContentsMargins(5, 5, 5, 5)
+        layout = _tab_layout(tab)
         
         # Model settings
         model_group = QGroupBox("AI Model")
@@ -604,8 +703,7 @@ class SettingsDialog(QDialog):
             QWidget: The configured privacy settings tab widget.
         """
         tab = QWidget()
-        layout = QVBoxLayout(tab)
-        layout.setContentsMargins(5, 5, 5, 5)
+        layout = _tab_layout(tab)
         
         # Data collection
         data_group = QGroupBox("Data Collection")
@@ -645,21 +743,23 @@ class SettingsDialog(QDialog):
         
         return tab
     
-    def _create_profiles_tab(self) -> QWidget:
-        """Create the AI profiles management tab.
-        
-        Returns:
-            QWidget: The configured profiles tab widget.
-        """
-        tab = QWidget()
-        layout = QVBoxLayout(tab)
-        layout.setContentsMargins(5, 5, 5, 5)
+    def _populate_profiles_tab(self) -> None:
+        """Build the AI profiles management tab contents."""
+        layout = _tab_layout(self.profiles_tab)
         
         # Add the profile manager widget
         self.profile_manager = ProfileManagerWidget(self.memory_manager)
         layout.addWidget(self.profile_manager)
+    
+    @pyqtSlot(int)
+    def _on_tab_changed(self, index: int) -> None:
+        """Populate the profiles tab the first time it is shown.
         
-        return tab
+        Args:
+            index: Index of the newly selected tab.
+        """
+        if self.profile_manager is None and self.tab_widget.widget(index) is self.profiles_tab:
+            self._populate_profiles_tab()
     
     def clear_chat_history(self) -> None:
         """Clear all chat history after confirmation."""
@@ -884,9 +984,7 @@ class SettingsDialog(QDialog):
     def create_appearance_tab(self) -> QWidget:
         """Create the appearance settings tab."""
         tab = QWidget()
-        layout = QVBoxLayout(tab)
-        layout.setContentsMargins(20, 20, 20, 20)
-        layout.setSpacing(15)
+        layout = _tab_layout(tab, WIDE_TAB_MARGINS, spacing=15)
         
         # Language settings
         lang_group = QGroupBox(tr("settings.language_group", default="Language & Region"))
@@ -963,9 +1061,7 @@ class SettingsDialog(QDialog):
     def create_chat_tab(self) -> QWidget:
         """Create the chat settings tab."""
         tab = QWidget()
-        layout = QVBoxLayout(tab)
-        layout.setContentsMargins(20, 20, 20, 20)
-        layout.setSpacing(15)
+        layout = _tab_layout(tab, WIDE_TAB_MARGINS, spacing=15)
         
         # Display options
         display_group = QGroupBox("Display Options")
@@ -1007,9 +1103,7 @@ class SettingsDialog(QDialog):
     def create_ai_tab(self) -> QWidget:
         """Create the AI settings tab."""
         tab = QWidget()
-        layout = QVBoxLayout(tab)
-        layout.setContentsMargins(20, 20, 20, 20)
-        layout.setSpacing(15)
+        layout = _tab_layout(tab, WIDE_TAB_MARGINS, spacing=15)
         
         # Model settings
         model_group = QGroupBox("AI Model")
@@ -1054,9 +1148,7 @@ class SettingsDialog(QDialog):
     def create_privacy_tab(self) -> QWidget:
         """Create the privacy settings tab."""
         tab = QWidget()
-        layout = QVBoxLayout(tab)
-        layout.setContentsMargins(20, 20, 20, 20)
-        layout.setSpacing(15)
+        layout = _tab_layout(tab, WIDE_TAB_MARGINS, spacing=15)
         
         # Data collection
         data_group = QGroupBox("Data Collection")
@@ -1166,12 +1258,18 @@ class SettingsDialog(QDialog):
         self.crash_reports_cb.setChecked(self.preferences.get('crash_reports', True))
         self.typing_analytics_cb.setChecked(self.preferences.get('typing_analytics', False))
     
-    def save_settings(self) -> Dict[str, Any]:
-        """Save settings from UI to preferences.
-        
+    def _get_all_settings(self) -> Dict[str, Any]:
+        """Collect the current settings from the UI.
+
+        The widgets are only queried again after one of them has changed;
+        otherwise the previously collected values are reused.
+
         Returns:
             Dict[str, Any]: Dictionary of all settings.
         """
+        if self._settings_cache is not None:
+            return dict(self._settings_cache)
+
         settings = {}
         
         # Language settings
@@ -1221,6 +1319,17 @@ class SettingsDialog(QDialog):
         settings["crash_reports"] = self.crash_reports_cb.isChecked()
         settings["typing_analytics"] = self.typing_analytics_cb.isChecked()
         
+        self._settings_cache = settings
+        return dict(settings)
+
+    def save_settings(self) -> Dict[str, Any]:
+        """Save settings from UI to preferences.
+        
+        Returns:
+            Dict[str, Any]: Dictionary of all settings.
+        """
+        settings = self._get_all_settings()
+        
         # Save to memory manager
         self.memory_manager.update_preferences(settings)
         
@@ -1241,9 +1350,23 @@ class SettingsDialog(QDialog):
         )
         
         if reply == QMessageBox.Yes:
-            # Reset to default preferences
+            # Reset to default preferences without a signal per widget
             self.preferences = UserPreferences()
-            self.load_settings()
+            widgets = self._input_widgets()
+            for widget in widgets:
+                widget.blockSignals(True)
+            try:
+                self.load_settings()
+            finally:
+                for widget in widgets:
+                    widget.blockSignals(False)
+            self._mark_dirty()
+            
+            # Refresh what the blocked theme, font and language slots update
+            self.apply_theme(self.preferences.theme)
+            self.update_theme_preview()
+            self.update_font_preview()
+            self.on_language_changed(self.language_combo.currentIndex())
             
             # Apply changes immediately
             self.theme_changed.emit(self.preferences.theme)
@@ -1295,35 +1418,26 @@ class SettingsDialog(QDialog):
         self.preferences["theme"] = theme
         self.theme_changed.emit(theme)
         self.apply_theme(theme)
-        
-        # Apply theme-specific styles
-        if theme == "dark":
-            self.setStyleSheet("""
-                QDialog { background-color: #1e1e2e; color: #cdd6f4; }
-                QLabel { color: #cdd6f4; }
-                QGroupBox::title { color: #89b4fa; }
-                #theme_preview {
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #1e1e2e, stop:1 #181825);
-                    border: 1px solid #313244;
-                    border-radius: 6px;
-                }
-            """)
-        elif theme == "light":
-            self.setStyleSheet("""
-                QDialog { background-color: #f5f5f5; color: #333333; }
-                QLabel { color: #333333; }
-                QGroupBox::title { color: #1e66f5; }
-                #theme_preview { 
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #f5f5f5, stop:1 #e6e6e6);
-                    border: 1px solid #d4d4d4;
-                    border-radius: 6px;
-                }
-            """)
-        # Add more themes as needed
-        
+
         # Update the preview
         self.update_theme_preview()
-    
+
+    def apply_theme(self, theme: ThemeName) -> None:
+        """Apply the dialog stylesheet for a theme.
+
+        All dialog rules live in a single stylesheet set once on the dialog,
+        so Qt parses it a single time and cascades it to every child widget.
+
+        Args:
+            theme: Internal theme name (e.g., "dark", "light").
+        """
+        stylesheet = DIALOG_STYLESHEETS.get(theme, COLOR_BUTTON_STYLESHEET)
+        # Compare against the string we last applied rather than reading
+        # styleSheet() back through Qt, and skip the re-parse if unchanged.
+        if stylesheet is not self._applied_stylesheet:
+            self._applied_stylesheet = stylesheet
+            self.setStyleSheet(stylesheet)
+
     def update_theme_preview(self) -> None:
         """Update the theme preview based on current settings."""
         theme_name = self.theme_combo.currentText()
@@ -4,440 +4,485 @@ Stylesheet generation for the application.
 This module provides functions to generate Qt stylesheets based on theme data.
 """
 
-def generate_stylesheet(theme: dict) -> str:
+import re
+from string import Template
+
+_QSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_QSS_WHITESPACE = re.compile(r"\s*([{}:;,])\s*|\s+")
+
+
+def _minify(qss: str) -> str:
     """
-    Generate a complete stylesheet for the application based on the theme.
+    Strip comments and redundant whitespace from a stylesheet.
     
     Args:
-        theme: Theme data dictionary
+        qss: Stylesheet source
         
     Returns:
-        str: Generated stylesheet
+        str: Equivalent stylesheet without comments or indentation
     """
-    colors = theme['colors']
-    sizes = theme['sizes']
-    
-    return f"""
+    qss = _QSS_COMMENT.sub("", qss)
+    return _QSS_WHITESPACE.sub(lambda m: m.group(1) or " ", qss).strip()
+
+
+# Application stylesheet, minified and compiled once at import. Placeholders
+# are the keys of a theme's 'colors' and 'sizes' dicts plus the derived
+# 'padding_half' and 'margin_half' values.
+_STYLESHEET_TEMPLATE = Template(_minify("""
     /* Base styles */
-    QWidget {{
-        background-color: {colors['window']};
-        color: {colors['text']};
-        selection-background-color: {colors['selection']};
-        selection-color: {colors['selection_text']};
-        border-radius: {sizes['border_radius']}px;
-    }}
+    QWidget {
+        background-color: ${window};
+        color: ${text};
+        selection-background-color: ${selection};
+        selection-color: ${selection_text};
+        border-radius: ${border_radius}px;
+    }
     
     /* Buttons */
-    QPushButton {{
-        background-color: {colors['button']};
-        color: {colors['button_text']};
-        border: 1px solid {colors['border']};
-        border-radius: {sizes['border_radius']}px;
-        padding: {sizes['padding']/2}px {sizes['padding']}px;
+    QPushButton {
+        background-color: ${button};
+        color: ${button_text};
+        border: 1px solid ${border};
+        border-radius: ${border_radius}px;
+        padding: ${padding_half}px ${padding}px;
         min-width: 80px;
-    }}
+    }
     
-    QPushButton:hover {{
-        background-color: {colors['hover']};
-    }}
+    QPushButton:hover {
+        background-color: ${hover};
+    }
     
-    QPushButton:pressed {{
-        background-color: {colors['pressed']};
-    }}
+    QPushButton:pressed {
+        background-color: ${pressed};
+    }
     
-    QPushButton:disabled {{
-        background-color: {colors['disabled_button']};
-        color: {colors['disabled_text']};
-        border-color: {colors['border']};
-    }}
+    QPushButton:disabled {
+        background-color: ${disabled_button};
+        color: ${disabled_text};
+        border-color: ${border};
+    }
     
     /* Line edits */
-    QLineEdit, QTextEdit, QPlainTextEdit, QComboBox, QSpinBox, QDoubleSpinBox, QDateEdit, QDateTimeEdit, QTimeEdit, QCompleter {{
-        background-color: {colors['base']};
-        color: {colors['text']};
-        border: 1px solid {colors['border']};
-        border-radius: {sizes['border_radius']}px;
-        padding: {sizes['padding']/2}px;
-        selection-background-color: {colors['highlight']};
-        selection-color: {colors['highlighted_text']};
-    }}
-    
-    QLineEdit:disabled, QTextEdit:disabled, QPlainTextEdit:disabled {{
-        background-color: {colors['alternate_base']};
-        color: {colors['disabled_text']};
-    }}
+    QLineEdit, QTextEdit, QPlainTextEdit, QComboBox, QSpinBox, QDoubleSpinBox {
+        background-color: ${base};
+        color: ${text};
+        border: 1px solid ${border};
+        border-radius: ${border_radius}px;
+        padding: ${padding_half}px;
+        selection-background-color: ${highlight};
+        selection-color: ${highlighted_text};
+    }
+    
+    /* Rarely used inputs, kept out of the common rule's selector list */
+    QDateEdit, QDateTimeEdit, QTimeEdit {
+        background-color: ${base};
+        color: ${text};
+        border: 1px solid ${border};
+        border-radius: ${border_radius}px;
+        padding: ${padding_half}px;
+        selection-background-color: ${highlight};
+        selection-color: ${highlighted_text};
+    }
+    
+    QLineEdit:disabled, QTextEdit:disabled, QPlainTextEdit:disabled {
+        background-color: ${alternate_base};
+        color: ${disabled_text};
+    }
     
     /* Scrollbars */
-    QScrollBar:vertical {{
+    QScrollBar:vertical {
         border: none;
-        background: {colors['alternate_base']};
+        background: ${alternate_base};
         width: 12px;
-        margin: 0px 0px 0px 0px;
-    }}
+    }
     
-    QScrollBar::handle:vertical {{
-        background: {colors['button']};
+    QScrollBar::handle:vertical {
+        background: ${button};
         min-height: 20px;
         border-radius: 6px;
-    }}
+    }
     
-    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
         height: 0px;
-    }}
+    }
     
-    QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {{
+    QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
         background: none;
-    }}
+    }
     
     /* Tabs */
-    QTabBar::tab {{
-        background: {colors['button']};
-        color: {colors['button_text']};
+    QTabBar::tab {
+        background: ${button};
+        color: ${button_text};
         padding: 6px 12px;
         margin-right: 2px;
-        border: 1px solid {colors['border']};
+        border: 1px solid ${border};
         border-bottom: none;
         border-top-left-radius: 4px;
         border-top-right-radius: 4px;
-    }}
+    }
     
-    QTabBar::tab:selected, QTabBar::tab:hover {{
-        background: {colors['window']};
-        color: {colors['text']};
-    }}
+    QTabBar::tab:selected, QTabBar::tab:hover {
+        background: ${window};
+        color: ${text};
+    }
     
-    QTabWidget::pane {{
-        border: 1px solid {colors['border']};
+    QTabWidget::pane {
+        border: 1px solid ${border};
         top: -1px;
-    }}
+    }
     
     /* Tooltips */
-    QToolTip {{
-        background-color: {colors['tool_tip_base']};
-        color: {colors['tool_tip_text']};
-        border: 1px solid {colors['border']};
+    QToolTip {
+        background-color: ${tool_tip_base};
+        color: ${tool_tip_text};
+        border: 1px solid ${border};
         padding: 4px;
-        border-radius: {sizes['border_radius']}px;
-    }}
+        border-radius: ${border_radius}px;
+    }
     
     /* Menu bar */
-    QMenuBar {{
-        background-color: {colors['window']};
-        color: {colors['text']};
-    }}
-    
-    QMenuBar::item:selected {{
-        background-color: {colors['highlight']};
-        color: {colors['highlighted_text']};
-    }}
-    
-    QMenu {{
-        background-color: {colors['window']};
-        color: {colors['text']};
-        border: 1px solid {colors['border']};
+    QMenuBar {
+        background-color: ${window};
+        color: ${text};
+    }
+    
+    QMenuBar::item:selected {
+        background-color: ${highlight};
+        color: ${highlighted_text};
+    }
+    
+    QMenu {
+        background-color: ${window};
+        color: ${text};
+        border: 1px solid ${border};
         padding: 4px;
-    }}
+    }
     
-    QMenu::item:selected {{
-        background-color: {colors['highlight']};
-        color: {colors['highlighted_text']};
-    }}
+    QMenu::item:selected {
+        background-color: ${highlight};
+        color: ${highlighted_text};
+    }
     
     /* Status bar */
-    QStatusBar {{
-        background-color: {colors['alternate_base']};
-        color: {colors['text']};
-        border-top: 1px solid {colors['border']};
-    }}
+    QStatusBar {
+        background-color: ${alternate_base};
+        color: ${text};
+        border-top: 1px solid ${border};
+    }
     
     /* Group boxes */
-    QGroupBox {{
-        border: 1px solid {colors['border']};
-        border-radius: {sizes['border_radius']}px;
+    QGroupBox {
+        border: 1px solid ${border};
+        border-radius: ${border_radius}px;
         margin-top: 1.5em;
         padding-top: 0.5em;
-    }}
+    }
     
-    QGroupBox::title {{
+    QGroupBox::title {
         subcontrol-origin: margin;
         left: 10px;
         padding: 0 3px;
-    }}
+    }
     
     /* Checkboxes and radio buttons */
-    QCheckBox::indicator, QRadioButton::indicator {{
+    QCheckBox::indicator, QRadioButton::indicator {
         width: 16px;
         height: 16px;
-    }}
+    }
     
-    QCheckBox::indicator:unchecked {{
-        border: 1px solid {colors['border']};
-        background: {colors['base']};
-    }}
+    QCheckBox::indicator:unchecked, QRadioButton::indicator:unchecked {
+        border: 1px solid ${border};
+        background: ${base};
+    }
     
-    QCheckBox::indicator:checked {{
-        border: 1px solid {colors['highlight']};
-        background: {colors['highlight']};
-    }}
-    
-    QRadioButton::indicator:unchecked {{
-        border: 1px solid {colors['border']};
-        background: {colors['base']};
-        border-radius: 7px;
-    }}
+    QCheckBox::indicator:checked, QRadioButton::indicator:checked {
+        border: 1px solid ${highlight};
+        background: ${highlight};
+    }
     
-    QRadioButton::indicator:checked {{
-        border: 1px solid {colors['highlight']};
-        background: {colors['highlight']};
+    QRadioButton::indicator {
         border-radius: 7px;
-    }}
+    }
     
     /* Progress bar */
-    QProgressBar {{
-        border: 1px solid {colors['border']};
+    QProgressBar {
+        border: 1px solid ${border};
         border-radius: 3px;
         text-align: center;
-    }}
+    }
     
-    QProgressBar::chunk {{
-        background-color: {colors['highlight']};
+    QProgressBar::chunk {
+        background-color: ${highlight};
         width: 10px;
         margin: 0.5px;
-    }}
+    }
     
     /* Slider */
-    QSlider::groove:horizontal {{
-        border: 1px solid {colors['border']};
+    QSlider::groove:horizontal {
+        border: 1px solid ${border};
         height: 8px;
-        background: {colors['base']};
+        background: ${base};
         margin: 2px 0;
         border-radius: 4px;
-    }}
+    }
     
-    QSlider::handle:horizontal {{
-        background: {colors['highlight']};
-        border: 1px solid {colors['highlight']};
+    QSlider::handle:horizontal {
+        background: ${highlight};
+        border: 1px solid ${highlight};
         width: 16px;
         margin: -4px 0;
         border-radius: 8px;
-    }}
+    }
     
     /* Scroll area */
-    QScrollArea {{
-        border: 1px solid {colors['border']};
-        border-radius: {sizes['border_radius']}px;
-        background: {colors['base']};
-    }}
+    QScrollArea {
+        border: 1px solid ${border};
+        border-radius: ${border_radius}px;
+        background: ${base};
+    }
     
     /* Splitter */
-    QSplitter::handle {{
-        background: {colors['border']};
+    QSplitter::handle {
+        background: ${border};
         width: 1px;
-    }}
+    }
     
-    QSplitter::handle:hover {{
-        background: {colors['highlight']};
-    }}
+    QSplitter::handle:hover {
+        background: ${highlight};
+    }
     
     /* Table and tree views */
-    QHeaderView::section {{
-        background-color: {colors['alternate_base']};
-        color: {colors['text']};
+    QHeaderView::section {
+        background-color: ${alternate_base};
+        color: ${text};
         padding: 4px;
-        border: 1px solid {colors['border']};
-    }}
+        border: 1px solid ${border};
+    }
     
-    QTreeView, QTableView, QListWidget, QTreeWidget {{
-        background-color: {colors['base']};
-        alternate-background-color: {colors['alternate_base']};
-        border: 1px solid {colors['border']};
-        border-radius: {sizes['border_radius']}px;
-    }}
+    QTreeView, QTableView, QListWidget, QTreeWidget {
+        background-color: ${base};
+        alternate-background-color: ${alternate_base};
+        border: 1px solid ${border};
+        border-radius: ${border_radius}px;
+    }
     
-    QTreeView::item:selected, QTableView::item:selected, QListWidget::item:selected, QTreeWidget::item:selected {{
-        background-color: {colors['highlight']};
-        color: {colors['highlighted_text']};
-    }}
+    QTreeView::item:selected, QTableView::item:selected, QListWidget::item:selected, QTreeWidget::item:selected {
+        background-color: ${highlight};
+        color: ${highlighted_text};
+    }
     
     /* Toolbar */
-    QToolBar {{
-        background-color: {colors['alternate_base']};
+    QToolBar {
+        background-color: ${alternate_base};
         border: none;
         spacing: 4px;
         padding: 4px;
-    }}
+    }
     
-    QToolButton {{
+    QToolButton {
         background: transparent;
         border: 1px solid transparent;
         border-radius: 3px;
         padding: 3px;
-    }}
+    }
     
-    QToolButton:hover, QToolButton:checked {{
-        background: {colors['hover']};
-        border: 1px solid {colors['border']};
-    }}
+    QToolButton:hover, QToolButton:checked {
+        background: ${hover};
+        border: 1px solid ${border};
+    }
     
-    QToolButton:pressed {{
-        background: {colors['pressed']};
-    }}
+    QToolButton:pressed {
+        background: ${pressed};
+    }
     
     /* Dialogs */
-    QDialog {{
-        background-color: {colors['window']};
-    }}
+    QDialog {
+        background-color: ${window};
+    }
     
-    QDialogButtonBox {{
-        border-top: 1px solid {colors['border']};
+    QDialogButtonBox {
+        border-top: 1px solid ${border};
         padding: 10px;
-    }}
+    }
     
     /* Custom widgets */
-    .TitleBar {{
-        background-color: {colors['titlebar']};
-        color: {colors['titlebar_text']};
+    .TitleBar {
+        background-color: ${titlebar};
+        color: ${titlebar_text};
         padding: 4px;
-        border-bottom: 1px solid {colors['border']};
-    }}
+        border-bottom: 1px solid ${border};
+    }
     
-    .StatusBar {{
-        background-color: {colors['alternate_base']};
-        border-top: 1px solid {colors['border']};
+    .StatusBar {
+        background-color: ${alternate_base};
+        border-top: 1px solid ${border};
         padding: 2px 8px;
-    }}
-    
-    .Card {{
-        background-color: {colors['base']};
-        border: 1px solid {colors['border']};
-        border-radius: {sizes['border_radius']}px;
-        padding: {sizes['padding']}px;
-        margin: {sizes['margin']/2}px 0;
-    }}
-    
-    .AccentButton {{
-        background-color: {colors['accent']};
+    }
+    
+    .Card {
+        background-color: ${base};
+        border: 1px solid ${border};
+        border-radius: ${border_radius}px;
+        padding: ${padding}px;
+        margin: ${margin_half}px 0;
+    }
+    
+    .AccentButton {
+        background-color: ${accent};
         color: white;
         font-weight: bold;
         border: none;
-        border-radius: {sizes['border_radius']}px;
+        border-radius: ${border_radius}px;
         padding: 6px 12px;
-    }}
+    }
     
-    .AccentButton:hover {{
-        background-color: {colors['accent_light']};
-    }}
+    .AccentButton:hover {
+        background-color: ${accent_light};
+    }
     
-    .AccentButton:pressed {{
-        background-color: {colors['accent_dark']};
-    }}
+    .AccentButton:pressed {
+        background-color: ${accent_dark};
+    }
     
-    .DangerButton {{
-        background-color: {colors['error']};
+    .DangerButton {
+        background-color: ${error};
         color: white;
         font-weight: bold;
         border: none;
-        border-radius: {sizes['border_radius']}px;
+        border-radius: ${border_radius}px;
         padding: 6px 12px;
-    }}
+    }
     
-    .DangerButton:hover {{
+    .DangerButton:hover {
         background-color: #c82333;
-    }}
+    }
     
-    .SuccessButton {{
-        background-color: {colors['success']};
+    .SuccessButton {
+        background-color: ${success};
         color: white;
         font-weight: bold;
         border: none;
-        border-radius: {sizes['border_radius']}px;
+        border-radius: ${border_radius}px;
         padding: 6px 12px;
-    }}
+    }
     
-    .SuccessButton:hover {{
+    .SuccessButton:hover {
         background-color: #218838;
-    }}
+    }
     
-    .WarningButton {{
-        background-color: {colors['warning']};
+    .WarningButton {
+        background-color: ${warning};
         color: #212529;
         font-weight: bold;
         border: none;
-        border-radius: {sizes['border_radius']}px;
+        border-radius: ${border_radius}px;
         padding: 6px 12px;
-    }}
+    }
     
-    .WarningButton:hover {{
+    .WarningButton:hover {
         background-color: #e0a800;
-    }}
+    }
     
     /* Custom scroll area that doesn't show scrollbars until needed */
-    .AutoScrollArea QScrollBar:vertical {{
+    .AutoScrollArea QScrollBar:vertical {
         width: 0px;
-    }}
+    }
     
-    .AutoScrollArea QScrollBar:horizontal {{
+    .AutoScrollArea QScrollBar:horizontal {
         height: 0px;
-    }}
+    }
     
-    .AutoScrollArea:hover QScrollBar:vertical {{
+    .AutoScrollArea:hover QScrollBar:vertical {
         width: 12px;
-    }}
+    }
     
-    .AutoScrollArea:hover QScrollBar:horizontal {{
+    .AutoScrollArea:hover QScrollBar:horizontal {
         height: 12px;
-    }}
+    }
     
     /* Custom tab widget with no frame */
-    .NoFrameTabWidget::pane {{
+    .NoFrameTabWidget::pane {
         border: none;
         top: 0px;
-    }}
+    }
     
     /* Custom line edit with search icon */
-    .SearchLineEdit {{
-        padding-left: 20px;
+    .SearchLineEdit {
         background-image: url(:/icons/search.png);
         background-position: left center;
         background-repeat: no-repeat;
         background-origin: content;
         padding-left: 30px;
-    }}
+    }
     
     /* Custom message boxes */
-    .MessageBoxIcon {{
+    .MessageBoxIcon {
         qproperty-pixmap: url(:/icons/info.png);
-    }}
+    }
     
-    .MessageBoxWarning .MessageBoxIcon {{
+    .MessageBoxWarning .MessageBoxIcon {
         qproperty-pixmap: url(:/icons/warning.png);
-    }}
+    }
     
-    .MessageBoxCritical .MessageBoxIcon {{
+    .MessageBoxCritical .MessageBoxIcon {
         qproperty-pixmap: url(:/icons/error.png);
-    }}
+    }
     
-    .MessageBoxQuestion .MessageBoxIcon {{
+    .MessageBoxQuestion .MessageBoxIcon {
         qproperty-pixmap: url(:/icons/question.png);
-    }}
+    }
     
     /* Custom tool buttons */
-    .ToolButton {{
+    .ToolButton {
         border: none;
         background: transparent;
         padding: 4px;
         border-radius: 3px;
-    }}
+    }
+    
+    .ToolButton:hover {
+        background: ${hover};
+    }
+    
+    .ToolButton:pressed {
+        background: ${pressed};
+    }
+
+    """))
+
+
+def generate_stylesheet(theme: dict) -> str:
+    """
+    Generate a complete stylesheet for the application based on the theme.
+    
+    Args:
+        theme: Theme data dictionary
+        
+    Returns:
+        str: Generated stylesheet
+    """
+    colors = theme['colors']
+    sizes = theme['sizes']
     
-    .ToolButton:hover {{
-        background: {colors['hover']};
-    }}
+    return _STYLESHEET_TEMPLATE.substitute(
+        colors,
+        **sizes,
+        padding_half=sizes['padding'] / 2,
+        margin_half=sizes['margin'] / 2,
+    )
+
+
+def apply_theme(app, theme: dict, stylesheet: str = None) -> None:
+    """
+    Apply the theme's stylesheet to the whole application.
     
-    .ToolButton:pressed {{
-        background: {colors['pressed']};
-    }}
+    This is the single place the generated stylesheet is handed to Qt; windows
+    and dialogs inherit it through the application-wide cascade.
     
-    .ToolButton:disabled {{
-        opacity: 0.5;
-    }}
+    Args:
+        app: The QApplication instance
+        theme: Theme data dictionary
+        stylesheet: Stylesheet already generated for the theme, if cached
     """
+    app.setStyleSheet(stylesheet if stylesheet is not None else generate_stylesheet(theme))
@@ -1,9 +1,16 @@
 import os
 import json
 import platform
-from typing import Dict, Optional, Union, List, Any
+import sys
+from functools import lru_cache
+from string import Template
+from types import MappingProxyType
+from typing import Dict, Optional, Union, List, Any, Mapping, Tuple, Callable
 
-from PyQt5.QtCore import Qt, QFile, QTextStream, QObject, pyqtSignal, QSettings
+from PyQt5.QtCore import (
+    Qt, QFile, QTextStream, QObject, pyqtSignal, pyqtSlot, QSettings, QThread, QProcess,
+    QRunnable, QThreadPool, QTimer
+)
 from PyQt5.QtGui import QColor, QPalette, QFont, QFontDatabase, QIcon
 
 # Platform-specific imports
@@ -17,6 +24,412 @@ try:
 except ImportError:
     pass
 
+# In-process GSettings access avoids forking gsettings on Linux
+try:
+    from gi.repository import Gio
+    HAS_GIO = True
+except (ImportError, ValueError):
+    HAS_GIO = False
+
+# Faster JSON parsing for custom themes when available
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _freeze_theme(theme: Dict[str, Any]) -> Mapping[str, Any]:
+    """Return a read-only view of a theme with its string values interned."""
+    return MappingProxyType({
+        key: sys.intern(value) if isinstance(value, str) else value
+        for key, value in theme.items()
+    })
+
+
+@lru_cache(maxsize=256)
+def _qcolor(value: str) -> QColor:
+    """Return a shared QColor for a color string; callers must not modify it."""
+    return QColor(value)
+
+
+# Keys every custom theme file must define
+_REQUIRED_THEME_FIELDS = frozenset({
+    'name', 'background', 'background_secondary', 'text_primary',
+    'accent', 'accent_light', 'accent_dark', 'success', 'warning', 'error'
+})
+
+# SetWindowTheme lives in uxtheme.dll; bind it once for title bar theming
+_SetWindowTheme = None
+if platform.system() == 'Windows':
+    try:
+        import ctypes
+        from ctypes import wintypes
+        _SetWindowTheme = ctypes.windll.uxtheme.SetWindowTheme
+        _SetWindowTheme.argtypes = [wintypes.HWND, wintypes.LPCWSTR, wintypes.LPCWSTR]
+        _SetWindowTheme.restype = ctypes.HRESULT
+    except (OSError, AttributeError):
+        _SetWindowTheme = None
+
+# Registry key holding the Windows light/dark preference
+_PERSONALIZE_KEY = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Themes\Personalize"
+
+
+# Theme-independent rules, identical for every theme
+_STATIC_CSS = """
+            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+                height: 0;
+            }
+            QCheckBox, QRadioButton {
+                spacing: 6px;
+            }
+            QCheckBox::indicator, QRadioButton::indicator {
+                width: 16px;
+                height: 16px;
+            }
+            QGroupBox::title {
+                subcontrol-origin: margin;
+                left: 10px;
+                padding: 0 3px;
+            }
+            @media (prefers-reduced-motion: reduce) {
+                * {
+                    transition: none !important;
+                    animation: none !important;
+                }
+            }
+            QMenuBar::item {
+                background: transparent;
+                padding: 4px 8px;
+            }
+            QScrollArea {
+                border: none;
+                background: transparent;
+            }
+"""
+
+# Color rules, substituted with a theme's properties
+_COLOR_CSS = Template("""
+        /* Base styles */
+            /* Global Styles */
+            QWidget {
+                color: ${text_primary};
+                selection-background-color: ${selection_bg};
+                selection-color: ${selection_text};
+            }
+            
+            /* Scroll Bars */
+            QScrollBar:vertical {
+                border: none;
+                background: ${background_secondary};
+                width: 8px;
+                margin: 0;
+            }
+            QScrollBar::handle:vertical {
+                background: ${scrollbar};
+                border-radius: 4px;
+                min-height: 20px;
+            }
+            QScrollBar::handle:vertical:hover {
+                background: ${scrollbar_hover};
+            }
+            
+            /* Buttons */
+            QPushButton {
+                background-color: ${background_tertiary};
+                color: ${text_primary};
+                border: 1px solid ${border};
+                border-radius: 4px;
+                padding: 6px 12px;
+            }
+            QPushButton:hover {
+                background-color: ${accent};
+                border-color: ${accent_light};
+            }
+            QPushButton:pressed {
+                background-color: ${accent_dark};
+            }
+            QPushButton:disabled {
+                background-color: ${background_secondary};
+                color: ${text_tertiary};
+                border-color: ${border};
+            }
+            
+            /* Line Edits */
+            QLineEdit, QTextEdit, QPlainTextEdit, QComboBox, QSpinBox, QDoubleSpinBox {
+                background-color: ${background_secondary};
+                color: ${text_primary};
+                border: 1px solid ${border};
+                border-radius: 4px;
+                padding: 6px 8px;
+                selection-background-color: ${accent};
+                selection-color: ${selection_text};
+            }
+            QLineEdit:focus, QTextEdit:focus, QPlainTextEdit:focus, 
+            QComboBox:focus, QSpinBox:focus, QDoubleSpinBox:focus {
+                border: 1px solid ${accent};
+            }
+            
+            /* Tabs */
+            QTabBar::tab {
+                background: ${background_secondary};
+                color: ${text_secondary};
+                border: 1px solid ${border};
+                border-bottom: none;
+                padding: 6px 12px;
+                margin-right: 2px;
+                border-top-left-radius: 4px;
+                border-top-right-radius: 4px;
+            }
+            QTabBar::tab:selected, QTabBar::tab:hover {
+                background: ${background};
+                color: ${text_primary};
+                border-bottom: 2px solid ${accent};
+            }
+            QTabWidget::pane {
+                border: 1px solid ${border};
+                border-top: none;
+                border-radius: 0 0 4px 4px;
+            }
+            
+            /* Tool Tips */
+            QToolTip {
+                background-color: ${tooltip_bg};
+                color: ${tooltip_text};
+                border: 1px solid ${border};
+                padding: 4px 8px;
+                border-radius: 4px;
+                opacity: 240;
+            }
+            
+            /* Checkboxes and Radio Buttons */
+            QCheckBox::indicator:unchecked {
+                border: 1px solid ${border};
+                background: ${background_secondary};
+            }
+            QCheckBox::indicator:checked {
+                border: 1px solid ${accent};
+                background: ${accent};
+            }
+            QRadioButton::indicator:unchecked {
+                border: 1px solid ${border};
+                background: ${background_secondary};
+                border-radius: 8px;
+            }
+            QRadioButton::indicator:checked {
+                border: 1px solid ${accent};
+                background: ${accent};
+                border-radius: 8px;
+            }
+            
+            /* Progress Bars */
+            QProgressBar {
+                border: 1px solid ${border};
+                border-radius: 4px;
+                text-align: center;
+                background: ${background_secondary};
+            }
+            QProgressBar::chunk {
+                background: ${accent};
+                border-radius: 2px;
+                margin: 1px;
+            }
+            
+            /* Group Boxes */
+            QGroupBox {
+                border: 1px solid ${border};
+                border-radius: 4px;
+                margin-top: 1em;
+                padding-top: 10px;
+            }
+            
+            /* Accessibility: High Contrast Mode */
+            .high-contrast * {
+                border: 1px solid ${text_primary} !important;
+            }
+            
+            /* Menu Bar */
+            QMenuBar {
+                background-color: ${background_secondary};
+                color: ${text_primary};
+                border-bottom: 1px solid ${border};
+            }
+            QMenuBar::item:selected {
+                background: ${highlight};
+                border-radius: 4px;
+            }
+            QMenu {
+                background-color: ${background_secondary};
+                color: ${text_primary};
+                border: 1px solid ${border};
+                padding: 4px;
+            }
+            QMenu::item:selected {
+                background: ${highlight};
+                border-radius: 2px;
+            }
+            
+            /* Status Bar */
+            QStatusBar {
+                background: ${background_secondary};
+                color: ${text_secondary};
+                border-top: 1px solid ${border};
+            }
+            
+            /* Dialogs */
+            QDialog {
+                background: ${background};
+            }
+            QDialogButtonBox {
+                border-top: 1px solid ${border};
+                padding: 8px;
+            }
+            
+            /* Custom Widgets */
+            #chatContainer, #inputArea, #modelSelector {
+                border: 1px solid ${border};
+                border-radius: 8px;
+                background: ${background_secondary};
+            }
+            
+            /* Custom Buttons */
+            .primary-button {
+                background: ${accent};
+                color: white;
+                font-weight: bold;
+                padding: 8px 16px;
+                border-radius: 6px;
+                border: none;
+            }
+            .primary-button:hover {
+                background: ${accent_light};
+            }
+            .primary-button:pressed {
+                background: ${accent_dark};
+            }
+            
+            /* Success, Warning, Error */
+            .success {
+                color: ${success};
+            }
+            .warning {
+                color: ${warning};
+            }
+            .error {
+                color: ${error};
+            }
+            
+            /* Custom Widgets */
+            .message-user {
+                background: ${accent}20;
+                border-left: 3px solid ${accent};
+                border-radius: 0 8px 8px 0;
+                margin: 4px 0;
+                padding: 8px 12px;
+            }
+            .message-ai {
+                background: ${background_tertiary};
+                border-radius: 8px 0 0 8px;
+                margin: 4px 0;
+                padding: 8px 12px;
+            }
+        """)
+
+
+class _RegistryThemeWatcher(QThread):
+    """Waits on Windows registry change notifications for the theme key.
+    
+    The thread sleeps in the kernel until the personalization key changes or
+    stop() is called, so there is no periodic wake-up.
+    """
+    changed = pyqtSignal()
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        import ctypes
+        self._kernel32 = ctypes.windll.kernel32
+        self._stop_event = self._kernel32.CreateEventW(None, True, False, None)
+    
+    def run(self):
+        import ctypes
+        from ctypes import wintypes
+        
+        REG_NOTIFY_CHANGE_LAST_SET = 0x00000004
+        WAIT_OBJECT_0 = 0x00000000
+        INFINITE = 0xFFFFFFFF
+        
+        advapi32 = ctypes.windll.advapi32
+        change_event = self._kernel32.CreateEventW(None, False, False, None)
+        handles = (wintypes.HANDLE * 2)(change_event, self._stop_event)
+        try:
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, _PERSONALIZE_KEY) as key:
+                while True:
+                    result = advapi32.RegNotifyChangeKeyValue(
+                        wintypes.HKEY(int(key)), False, REG_NOTIFY_CHANGE_LAST_SET,
+                        change_event, True
+                    )
+                    if result != 0:
+                        break
+                    if self._kernel32.WaitForMultipleObjects(2, handles, False, INFINITE) != WAIT_OBJECT_0:
+                        break
+                    self.changed.emit()
+        except OSError:
+            pass
+        finally:
+            self._kernel32.CloseHandle(change_event)
+    
+    def stop(self):
+        """Wake the watcher and wait for it to exit."""
+        self._kernel32.SetEvent(self._stop_event)
+        self.wait()
+
+
+def _read_theme_file(file_path: str) -> Optional[Dict[str, Any]]:
+    """Read and validate a custom theme JSON file.
+    
+    Args:
+        file_path: Path to the JSON theme file
+        
+    Returns:
+        The theme properties, or None if the file is unreadable or invalid
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        theme_data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+    except (ValueError, IOError) as e:
+        print(f"Error loading theme from {file_path}: {e}")
+        return None
+    
+    # Validate theme data
+    if not isinstance(theme_data, dict):
+        print("Invalid theme: Expected a JSON object")
+        return None
+    missing = _REQUIRED_THEME_FIELDS - theme_data.keys()
+    if missing:
+        print(f"Invalid theme: Missing required fields {sorted(missing)}")
+        return None
+    return theme_data
+
+
+class _ThemeLoaderSignals(QObject):
+    """Signals for _ThemeLoader; QRunnable cannot emit signals itself."""
+    finished = pyqtSignal(str, object, object)  # file path, theme data or None, callback
+
+
+class _ThemeLoader(QRunnable):
+    """Reads a custom theme file on a thread pool thread."""
+    
+    def __init__(self, file_path: str, on_done: Optional[Callable[[bool], None]]):
+        super().__init__()
+        self.file_path = file_path
+        self.on_done = on_done
+        self.signals = _ThemeLoaderSignals()
+    
+    def run(self):
+        self.signals.finished.emit(self.file_path, _read_theme_file(self.file_path), self.on_done)
+
+
 class ThemeManager(QObject):
     # Signal emitted when the theme is changed
     theme_changed = pyqtSignal(str, dict)
@@ -152,6 +565,27 @@ class ThemeManager(QObject):
             "selection_text": "#eceff4",
         },
     }
+    # Themes are shared by the per-theme caches, so keep them immutable
+    THEMES = {name: _freeze_theme(theme) for name, theme in THEMES.items()}
+    
+    # (color group, palette role, theme key) triples used by _build_palette
+    _ROLE_MAP = (
+        (QPalette.All, QPalette.Window, "background"),
+        (QPalette.All, QPalette.WindowText, "text_primary"),
+        (QPalette.All, QPalette.Base, "background_secondary"),
+        (QPalette.All, QPalette.AlternateBase, "background_tertiary"),
+        (QPalette.All, QPalette.ToolTipBase, "tooltip_bg"),
+        (QPalette.All, QPalette.ToolTipText, "tooltip_text"),
+        (QPalette.All, QPalette.Text, "text_primary"),
+        (QPalette.All, QPalette.Button, "background_secondary"),
+        (QPalette.All, QPalette.ButtonText, "text_primary"),
+        (QPalette.All, QPalette.Link, "accent"),
+        (QPalette.All, QPalette.Highlight, "accent"),
+        (QPalette.All, QPalette.HighlightedText, "selection_text"),
+        (QPalette.Disabled, QPalette.WindowText, "text_tertiary"),
+        (QPalette.Disabled, QPalette.Text, "text_tertiary"),
+        (QPalette.Disabled, QPalette.ButtonText, "text_tertiary"),
+    )
     
     def __init__(self, app, default_theme="auto"):
         """Initialize the theme manager.
@@ -163,43 +597,91 @@ class ThemeManager(QObject):
         super().__init__(app)
         self.app = app
         self.settings = QSettings("PashtoAI", "ThemeManager")
+        # True while a coalesced settings sync is pending
+        self._settings_dirty = False
         self.current_theme = default_theme
         self.custom_themes = {}
+        # Rendered stylesheets keyed by theme name
+        self._stylesheet_cache: Dict[str, str] = {}
+        # Palettes keyed by theme name
+        self._palette_cache: Dict[str, QPalette] = {}
+        # Stylesheet currently installed on the application
+        self._applied_stylesheet: Optional[str] = None
+        # Name of the theme last applied by set_theme
+        self._last_applied_effective: Optional[str] = None
+        # Theme previews keyed by (theme name, width, height)
+        self._preview_cache: Dict[Tuple[str, int, int], str] = {}
+        # Last detected system theme, cleared by change notifications
+        self._cached_system_theme: Optional[str] = None
         self.load_fonts()
         self._setup_theme_watcher()
     
     def _setup_theme_watcher(self):
-        """Set up system theme change detection if available."""
+        """Subscribe to system theme change notifications if available."""
         if platform.system() == 'Windows':
-            # Windows 10/11 theme detection
+            # Windows 10/11: wait on registry change notifications
             try:
-                key = winreg.OpenKey(
-                    winreg.HKEY_CURRENT_USER,
-                    r"SOFTWARE\Microsoft\Windows\CurrentVersion\Themes\Personalize"
-                )
-                # Check every 5 seconds for theme changes
-                self.theme_timer = self.startTimer(5000)
-            except WindowsError:
+                self._theme_watcher = _RegistryThemeWatcher(self)
+                self._theme_watcher.changed.connect(self._on_system_theme_changed)
+                self.app.aboutToQuit.connect(self._theme_watcher.stop)
+                self._theme_watcher.start()
+            except Exception:
                 pass
         elif platform.system() == 'Darwin':
-            # macOS theme detection
+            # macOS: observe the distributed appearance notification
             try:
-                self.theme_timer = self.startTimer(5000)
+                from Foundation import NSDistributedNotificationCenter, NSOperationQueue
+                self._theme_observer = NSDistributedNotificationCenter.defaultCenter().addObserverForName_object_queue_usingBlock_(
+                    'AppleInterfaceThemeChangedNotification', None,
+                    NSOperationQueue.mainQueue(),
+                    lambda notification: self._on_system_theme_changed()
+                )
             except Exception:
-                pass
+                # Fall back to polling when PyObjC is unavailable
+                try:
+                    self.theme_timer = self.startTimer(5000)
+                except Exception:
+                    pass
+        elif platform.system() == 'Linux':
+            # GNOME: stream GSettings change events from a long-lived monitor
+            self._theme_monitor = QProcess(self)
+            self._theme_monitor.readyReadStandardOutput.connect(self._on_gsettings_output)
+            self._theme_monitor.start(
+                'gsettings', ['monitor', 'org.gnome.desktop.interface', 'gtk-theme']
+            )
+            self.app.aboutToQuit.connect(self._theme_monitor.kill)
+
+    def _on_gsettings_output(self):
+        """Handle a change line printed by ``gsettings monitor``."""
+        self._theme_monitor.readAllStandardOutput()
+        self._on_system_theme_changed()
+
+    def _on_system_theme_changed(self):
+        """React to a system light/dark theme change notification."""
+        self._cached_system_theme = None
+        current_system_theme = self.get_system_theme()
+        if getattr(self, '_last_system_theme', None) != current_system_theme:
+            self.system_theme_changed.emit(current_system_theme)
+            if self.current_theme == 'auto':
+                self.set_theme('auto')
+        self._last_system_theme = current_system_theme
 
     def timerEvent(self, event):
-        """Handle timer events for theme change detection."""
+        """Handle timer events for polling-based theme change detection."""
         if event.timerId() == getattr(self, 'theme_timer', None):
-            current_system_theme = self.get_system_theme()
-            if hasattr(self, '_last_system_theme') and self._last_system_theme != current_system_theme:
-                self.system_theme_changed.emit(current_system_theme)
-                if self.current_theme == 'auto':
-                    self.set_theme('auto')
-            self._last_system_theme = current_system_theme
+            self._on_system_theme_changed()
 
     def get_system_theme(self) -> str:
-        """Detect the current system theme (light or dark)."""
+        """Return the current system theme (light or dark).
+        
+        The result is cached until a system theme change notification arrives.
+        """
+        if self._cached_system_theme is None:
+            self._cached_system_theme = self._detect_system_theme()
+        return self._cached_system_theme
+
+    def _detect_system_theme(self) -> str:
+        """Query the OS for the current system theme (light or dark)."""
         if platform.system() == 'Windows':
             try:
                 key = winreg.OpenKey(
@@ -218,8 +700,14 @@ class ThemeManager(QObject):
             except Exception:
                 pass
         elif platform.system() == 'Linux':
+            if HAS_GIO:
+                try:
+                    gtk_theme = Gio.Settings.new('org.gnome.desktop.interface').get_string('gtk-theme')
+                    return 'dark' if 'dark' in gtk_theme.lower() else 'light'
+                except Exception:
+                    pass
             try:
-                # Try to use gsettings (GNOME)
+                # Fall back to the gsettings CLI (GNOME)
                 result = subprocess.run(
                     ['gsettings', 'get', 'org.gnome.desktop.interface', 'gtk-theme'],
                     capture_output=True, text=True
@@ -250,19 +738,14 @@ class ThemeManager(QObject):
                     print(f"Loaded font: {font_family} from {path}")
                     break
         
-        # Set default font with fallbacks
-        self.default_font = QFont()
-        font_db = QFontDatabase()
-        available_families = font_db.families()
-        if 'Inter' in available_families:
-            self.default_font.setFamily('Inter')
-        elif 'Segoe UI' in available_families:
-            self.default_font.setFamily('Segoe UI')
-        elif 'SF Pro Display' in available_families:
-            self.default_font.setFamily('SF Pro Display')
-        else:
-            self.default_font.setFamily('Arial')
-        
+        # Set default font with fallbacks, enumerating the font database once
+        available_families = set(QFontDatabase().families())
+        self._default_family = next(
+            (family for family in ('Inter', 'Segoe UI', 'SF Pro Display')
+             if family in available_families),
+            'Arial'
+        )
+        self.default_font = QFont(self._default_family)
         self.default_font.setPointSize(10)
         self.app.setFont(self.default_font)
     
@@ -300,6 +783,11 @@ class ThemeManager(QObject):
         Returns:
             bool: True if theme was set successfully, False otherwise
         """
+        # Nothing to do if the resolved theme is already applied
+        effective = self.get_system_theme() if theme_name == 'auto' else theme_name
+        if effective == self._last_applied_effective:
+            return True
+        
         if theme_name == 'auto':
             theme = self.get_theme('auto')
             theme_name = self.get_system_theme()
@@ -312,43 +800,42 @@ class ThemeManager(QObject):
             
         self.current_theme = theme_name
         self.settings.setValue("current_theme", theme_name)
+        self._schedule_settings_sync()
         
         # Set application style
         self.app.setStyle("Fusion")
         
-        # Create a palette
-        palette = QPalette()
-        
-        # Base colors
-        palette.setColor(QPalette.Window, QColor(theme["background"]))
-        palette.setColor(QPalette.WindowText, QColor(theme["text_primary"]))
-        palette.setColor(QPalette.Base, QColor(theme["background_secondary"]))
-        palette.setColor(QPalette.AlternateBase, QColor(theme["background_tertiary"]))
-        palette.setColor(QPalette.ToolTipBase, QColor(theme["tooltip_bg"]))
-        palette.setColor(QPalette.ToolTipText, QColor(theme["tooltip_text"]))
-        palette.setColor(QPalette.Text, QColor(theme["text_primary"]))
-        palette.setColor(QPalette.Button, QColor(theme["background_secondary"]))
-        palette.setColor(QPalette.ButtonText, QColor(theme["text_primary"]))
-        palette.setColor(QPalette.BrightText, Qt.red)
-        palette.setColor(QPalette.Link, QColor(theme["accent"]))
-        palette.setColor(QPalette.Highlight, QColor(theme["accent"]))
-        palette.setColor(QPalette.HighlightedText, QColor(theme["selection_text"]))
-        
-        # Disabled colors
-        palette.setColor(QPalette.Disabled, QPalette.WindowText, QColor(theme["text_tertiary"]))
-        palette.setColor(QPalette.Disabled, QPalette.Text, QColor(theme["text_tertiary"]))
-        palette.setColor(QPalette.Disabled, QPalette.ButtonText, QColor(theme["text_tertiary"]))
-        
-        # Set the palette
+        # Build the palette once per theme and reuse it afterwards
+        palette = self._palette_cache.get(theme_name)
+        if palette is None:
+            palette = self._build_palette(theme)
+            self._palette_cache[theme_name] = palette
         self.app.setPalette(palette)
         
         # Set application font
-        font = QFont("Inter" if "Inter" in QFontDatabase.families() else "Segoe UI")
-        font.setPointSize(10)
-        self.app.setFont(font)
+        if self.app.font() != self.default_font:
+            self.app.setFont(self.default_font)
         
         # Apply stylesheet
         self._apply_stylesheet(theme)
+        self._last_applied_effective = theme_name
+        return True
+    
+    def _build_palette(self, theme: Dict[str, str]) -> QPalette:
+        """Build the application palette for a theme.
+        
+        Args:
+            theme: Dictionary containing theme properties
+            
+        Returns:
+            QPalette: Palette with the theme's colors
+        """
+        palette = QPalette()
+        for group, role, key in self._ROLE_MAP:
+            palette.setColor(group, role, _qcolor(theme[key]))
+        palette.setColor(QPalette.BrightText, Qt.red)
+        
+        return palette
     
     def load_custom_theme(self, file_path: str) -> bool:
         """Load a custom theme from a JSON file.
@@ -359,31 +846,67 @@ class ThemeManager(QObject):
         Returns:
             bool: True if theme was loaded successfully, False otherwise
         """
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                theme_data = json.load(f)
-            
-            # Validate theme data
-            required_fields = {
-                'name', 'background', 'background_secondary', 'text_primary',
-                'accent', 'accent_light', 'accent_dark', 'success', 'warning', 'error'
-            }
-            
-            if not all(field in theme_data for field in required_fields):
-                print("Invalid theme: Missing required fields")
-                return False
-                
-            theme_name = os.path.splitext(os.path.basename(file_path))[0]
-            self.custom_themes[theme_name] = theme_data
-            self.settings.beginGroup("CustomThemes")
-            self.settings.setValue(theme_name, file_path)
-            self.settings.endGroup()
-            
-            return True
-            
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error loading theme from {file_path}: {e}")
+        theme_data = _read_theme_file(file_path)
+        if theme_data is None:
             return False
+        self._register_custom_theme(file_path, theme_data)
+        return True
+    
+    def load_custom_theme_async(self, file_path: str,
+                                on_done: Optional[Callable[[bool], None]] = None) -> None:
+        """Load a custom theme from a JSON file without blocking the UI thread.
+        
+        The file is read on the global thread pool and the theme is registered
+        back on this object's thread.
+        
+        Args:
+            file_path: Path to the JSON theme file
+            on_done: Optional callback receiving True if the theme was loaded
+        """
+        loader = _ThemeLoader(file_path, on_done)
+        loader.signals.finished.connect(self._finish_load_custom_theme)
+        QThreadPool.globalInstance().start(loader)
+    
+    @pyqtSlot(str, object, object)
+    def _finish_load_custom_theme(self, file_path: str, theme_data: Optional[Dict[str, Any]],
+                                  on_done: Optional[Callable[[bool], None]]) -> None:
+        """Register a theme read by load_custom_theme_async."""
+        if theme_data is not None:
+            self._register_custom_theme(file_path, theme_data)
+        if on_done is not None:
+            on_done(theme_data is not None)
+    
+    def _register_custom_theme(self, file_path: str, theme_data: Dict[str, Any]) -> None:
+        """Store a validated custom theme and drop its cached artifacts.
+        
+        Args:
+            file_path: Path the theme was loaded from
+            theme_data: Validated theme properties
+        """
+        theme_name = os.path.splitext(os.path.basename(file_path))[0]
+        self.custom_themes[theme_name] = _freeze_theme(theme_data)
+        self._stylesheet_cache.pop(theme_name, None)
+        self._palette_cache.pop(theme_name, None)
+        for key in [key for key in self._preview_cache if key[0] == theme_name]:
+            del self._preview_cache[key]
+        if self._last_applied_effective == theme_name:
+            self._last_applied_effective = None
+        self.settings.beginGroup("CustomThemes")
+        self.settings.setValue(theme_name, file_path)
+        self.settings.endGroup()
+        self._schedule_settings_sync()
+    
+    def _schedule_settings_sync(self) -> None:
+        """Coalesce pending settings writes into one sync shortly after."""
+        if self._settings_dirty:
+            return
+        self._settings_dirty = True
+        QTimer.singleShot(500, self._flush_settings)
+    
+    def _flush_settings(self) -> None:
+        """Write pending settings changes to storage."""
+        self.settings.sync()
+        self._settings_dirty = False
     
     def get_available_themes(self) -> Dict[str, str]:
         """Get a dictionary of available theme names and their display names.
@@ -408,9 +931,29 @@ class ThemeManager(QObject):
         Returns:
             str: HTML/CSS string for the preview
         """
-        theme = self.get_theme(theme_name)
         width, height = size
+        cacheable = theme_name in self.THEMES or theme_name in self.custom_themes
+        key = (theme_name, width, height)
+        if cacheable and key in self._preview_cache:
+            return self._preview_cache[key]
         
+        preview = self._render_theme_preview(theme_name, self.get_theme(theme_name), width, height)
+        if cacheable:
+            self._preview_cache[key] = preview
+        return preview
+    
+    def _render_theme_preview(self, theme_name: str, theme: Dict[str, str], width: int, height: int) -> str:
+        """Render the HTML/CSS preview for a theme.
+        
+        Args:
+            theme_name: Name of the theme to preview
+            theme: Dictionary containing theme properties
+            width: Preview width in pixels
+            height: Preview height in pixels
+            
+        Returns:
+            str: HTML/CSS string for the preview
+        """
         return f"""
         <div style="
             width: {width}px;
@@ -479,294 +1022,36 @@ class ThemeManager(QObject):
         Args:
             theme: Dictionary containing theme properties
         """
-        # Generate CSS variables for easier theming
-        css_vars = '\n'.join(f'    --{k.replace("_", "-")}: {v};' for k, v in theme.items())
+        stylesheet = self._stylesheet_cache.get(self.current_theme)
+        if stylesheet is None:
+            stylesheet = self._render_stylesheet(theme)
+            self._stylesheet_cache[self.current_theme] = stylesheet
         
-        # Base stylesheet with CSS variables
-        stylesheet = f"""
-        /* CSS Variables for theming */
-        :root {{
-{css_vars}
-        }}
-        
-        /* Base styles */
-            /* Global Styles */
-            QWidget {{
-                color: {theme['text_primary']};
-                selection-background-color: {theme['selection_bg']};
-                selection-color: {theme['selection_text']};
-            }}
-            
-            /* Scroll Bars */
-            QScrollBar:vertical {{
-                border: none;
-                background: {theme['background_secondary']};
-                width: 8px;
-                margin: 0;
-            }}
-            QScrollBar::handle:vertical {{
-                background: {theme['scrollbar']};
-                border-radius: 4px;
-                min-height: 20px;
-            }}
-            QScrollBar::handle:vertical:hover {{
-                background: {theme['scrollbar_hover']};
-            }}
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
-                height: 0;
-            }}
-            
-            /* Buttons */
-            QPushButton {{
-                background-color: {theme['background_tertiary']};
-                color: {theme['text_primary']};
-                border: 1px solid {theme['border']};
-                border-radius: 4px;
-                padding: 6px 12px;
-            }}
-            QPushButton:hover {{
-                background-color: {theme['accent']};
-                border-color: {theme['accent_light']};
-            }}
-            QPushButton:pressed {{
-                background-color: {theme['accent_dark']};
-            }}
-            QPushButton:disabled {{
-                background-color: {theme['background_secondary']};
-                color: {theme['text_tertiary']};
-                border-color: {theme['border']};
-            }}
-            
-            /* Line Edits */
-            QLineEdit, QTextEdit, QPlainTextEdit, QComboBox, QSpinBox, QDoubleSpinBox {{
-                background-color: {theme['background_secondary']};
-                color: {theme['text_primary']};
-                border: 1px solid {theme['border']};
-                border-radius: 4px;
-                padding: 6px 8px;
-                selection-background-color: {theme['accent']};
-                selection-color: {theme['selection_text']};
-            }}
-            QLineEdit:focus, QTextEdit:focus, QPlainTextEdit:focus, 
-            QComboBox:focus, QSpinBox:focus, QDoubleSpinBox:focus {{
-                border: 1px solid {theme['accent']};
-            }}
-            
-            /* Tabs */
-            QTabBar::tab {{
-                background: {theme['background_secondary']};
-                color: {theme['text_secondary']};
-                border: 1px solid {theme['border']};
-                border-bottom: none;
-                padding: 6px 12px;
-                margin-right: 2px;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-            }}
-            QTabBar::tab:selected, QTabBar::tab:hover {{
-                background: {theme['background']};
-                color: {theme['text_primary']};
-                border-bottom: 2px solid {theme['accent']};
-            }}
-            QTabWidget::pane {{
-                border: 1px solid {theme['border']};
-                border-top: none;
-                border-radius: 0 0 4px 4px;
-            }}
-            
-            /* Tool Tips */
-            QToolTip {{
-                background-color: var(--tooltip-bg);
-                color: var(--tooltip-text);
-                border: 1px solid var(--border);
-                padding: 6px 8px;
-                border-radius: 4px;
-                opacity: 240;
-            }}
-            
-            /* Checkboxes and Radio Buttons */
-            QCheckBox, QRadioButton {{
-                spacing: 6px;
-            }}
-            QCheckBox::indicator, QRadioButton::indicator {{
-                width: 16px;
-                height: 16px;
-            }}
-            QCheckBox::indicator:unchecked {{
-                border: 1px solid var(--border);
-                background: var(--background-secondary);
-            }}
-            QCheckBox::indicator:checked {{
-                border: 1px solid var(--accent);
-                background: var(--accent);
-            }}
-            QRadioButton::indicator:unchecked {{
-                border: 1px solid var(--border);
-                background: var(--background-secondary);
-                border-radius: 8px;
-            }}
-            QRadioButton::indicator:checked {{
-                border: 1px solid var(--accent);
-                background: var(--accent);
-                border-radius: 8px;
-            }}
-            
-            /* Progress Bars */
-            QProgressBar {{
-                border: 1px solid var(--border);
-                border-radius: 4px;
-                text-align: center;
-                background: var(--background-secondary);
-            }}
-            QProgressBar::chunk {{
-                background: var(--accent);
-                border-radius: 2px;
-                margin: 1px;
-            }}
-            
-            /* Group Boxes */
-            QGroupBox {{
-                border: 1px solid var(--border);
-                border-radius: 4px;
-                margin-top: 1em;
-                padding-top: 10px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 3px;
-            }}
-            
-            /* Accessibility: High Contrast Mode */
-            .high-contrast * {{
-                border: 1px solid var(--text-primary) !important;
-            }}
-            
-            /* Reduced Motion */
-            @media (prefers-reduced-motion: reduce) {{
-                * {{
-                    transition: none !important;
-                    animation: none !important;
-                }}
-            }}
-            QToolTip {{
-                background-color: {theme['tooltip_bg']};
-                color: {theme['tooltip_text']};
-                border: 1px solid {theme['border']};
-                padding: 4px 8px;
-                border-radius: 4px;
-            }}
-            
-            /* Menu Bar */
-            QMenuBar {{
-                background-color: {theme['background_secondary']};
-                color: {theme['text_primary']};
-                border-bottom: 1px solid {theme['border']};
-            }}
-            QMenuBar::item {{
-                background: transparent;
-                padding: 4px 8px;
-            }}
-            QMenuBar::item:selected {{
-                background: {theme['highlight']};
-                border-radius: 4px;
-            }}
-            QMenu {{
-                background-color: {theme['background_secondary']};
-                color: {theme['text_primary']};
-                border: 1px solid {theme['border']};
-                padding: 4px;
-            }}
-            QMenu::item:selected {{
-                background: {theme['highlight']};
-                border-radius: 2px;
-            }}
-            
-            /* Status Bar */
-            QStatusBar {{
-                background: {theme['background_secondary']};
-                color: {theme['text_secondary']};
-                border-top: 1px solid {theme['border']};
-            }}
-            
-            /* Dialogs */
-            QDialog {{
-                background: {theme['background']};
-            }}
-            QDialogButtonBox {{
-                border-top: 1px solid {theme['border']};
-                padding: 8px;
-            }}
-            
-            /* Custom Widgets */
-            #chatContainer, #inputArea, #modelSelector {{
-                border: 1px solid {theme['border']};
-                border-radius: 8px;
-                background: {theme['background_secondary']};
-            }}
-            
-            /* Custom Scroll Areas */
-            QScrollArea {{
-                border: none;
-                background: transparent;
-            }}
-            
-            /* Custom Buttons */
-            .primary-button {{
-                background: {theme['accent']};
-                color: white;
-                font-weight: bold;
-                padding: 8px 16px;
-                border-radius: 6px;
-                border: none;
-            }}
-            .primary-button:hover {{
-                background: {theme['accent_light']};
-            }}
-            .primary-button:pressed {{
-                background: {theme['accent_dark']};
-            }}
-            
-            /* Success, Warning, Error */
-            .success {{
-                color: {theme['success']};
-            }}
-            .warning {{
-                color: {theme['warning']};
-            }}
-            .error {{
-                color: {theme['error']};
-            }}
-            
-            /* Custom Widgets */
-            .message-user {{
-                background: {theme['accent']}20;
-                border-left: 3px solid {theme['accent']};
-                border-radius: 0 8px 8px 0;
-                margin: 4px 0;
-                padding: 8px 12px;
-            }}
-            .message-ai {{
-                background: {theme['background_tertiary']};
-                border-radius: 8px 0 0 8px;
-                margin: 4px 0;
-                padding: 8px 12px;
-            }}
-        """
-        
-        # Apply the stylesheet
-        self.app.setStyleSheet(stylesheet)
+        # Apply the stylesheet, skipping Qt's restyle pass if nothing changed
+        if stylesheet != self._applied_stylesheet:
+            self.app.setStyleSheet(stylesheet)
+            self._applied_stylesheet = stylesheet
         
         # Emit theme changed signal
-        self.theme_changed.emit(self.current_theme, theme)
+        self.theme_changed.emit(self.current_theme, dict(theme))
         
         # Notify system of theme change for platform integration
-        if platform.system() == 'Windows':
+        if _SetWindowTheme is not None:
             try:
                 # This helps with Windows 10/11 taskbar and title bar theming
-                from ctypes import windll
-                hwnd = self.app.activeWindow().winId() if self.app.activeWindow() else 0
-                if hwnd:
-                    windll.user32.SetWindowTheme(hwnd, 'DarkMode_Explorer' if self.current_theme == 'dark' else 'Explorer', None)
+                window = self.app.activeWindow()
+                if window is not None:
+                    _SetWindowTheme(int(window.winId()), 'DarkMode_Explorer' if self.current_theme == 'dark' else 'Explorer', None)
             except Exception:
                 pass
+    
+    def _render_stylesheet(self, theme: Dict[str, str]) -> str:
+        """Render the application stylesheet for a theme.
+        
+        Args:
+            theme: Dictionary containing theme properties
+            
+        Returns:
+            str: The complete stylesheet
+        """
+        return _STATIC_CSS + _COLOR_CSS.substitute(theme)
@@ -6,14 +6,70 @@ including light/dark mode switching and custom color schemes.
 """
 
 import json
-import os
-from pathlib import Path
-from typing import Dict, Any, Optional, Tuple, List
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Tuple, List, Mapping
 
-from PyQt5.QtCore import QObject, pyqtSignal, QSettings, QStandardPaths
-from PyQt5.QtGui import QColor, QPalette, QFont, QFontDatabase, QIcon
+from PyQt5.QtCore import QObject, pyqtSignal, QSettings, QTimer
+from PyQt5.QtGui import QColor, QPalette, QFont
 from PyQt5.QtWidgets import QApplication, QStyleFactory
 
+# Faster parsing of custom themes stored as JSON by older versions
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _loads(data: str) -> Any:
+    """Parse a JSON string."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# (palette role, theme color key) pairs applied by ThemeManager._apply_theme
+_PALETTE_ROLES = (
+    (QPalette.Window, 'window'),
+    (QPalette.WindowText, 'window_text'),
+    (QPalette.Base, 'base'),
+    (QPalette.AlternateBase, 'alternate_base'),
+    (QPalette.ToolTipBase, 'tool_tip_base'),
+    (QPalette.ToolTipText, 'tool_tip_text'),
+    (QPalette.Text, 'text'),
+    (QPalette.Button, 'button'),
+    (QPalette.ButtonText, 'button_text'),
+    (QPalette.BrightText, 'bright_text'),
+    (QPalette.Link, 'link'),
+    (QPalette.Highlight, 'highlight'),
+    (QPalette.HighlightedText, 'highlighted_text'),
+)
+
+# Same for the Disabled color group
+_DISABLED_ROLES = (
+    (QPalette.WindowText, 'disabled_text'),
+    (QPalette.Button, 'disabled_button'),
+    (QPalette.Highlight, 'disabled_highlight'),
+    (QPalette.HighlightedText, 'highlighted_text'),
+    (QPalette.Text, 'disabled_text'),
+    (QPalette.ButtonText, 'disabled_text'),
+)
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively wrap dicts in read-only mapping proxies."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Recursively copy mappings (including read-only proxies) into plain dicts."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    return value
+
+
 class ThemeManager(QObject):
     """
     Manages application themes and styles.
@@ -197,6 +253,11 @@ class ThemeManager(QObject):
         }
     }
     
+    # Built-in themes are shared, read-only data
+    BUILTIN_THEMES = _freeze(BUILTIN_THEMES)
+    LIGHT_THEME = BUILTIN_THEMES['Light']
+    DARK_THEME = BUILTIN_THEMES['Dark']
+    
     def __init__(self, app: QApplication):
         """
         Initialize the theme manager.
@@ -209,6 +270,18 @@ class ThemeManager(QObject):
         self.settings = QSettings("PashtoAI", "ThemeSettings")
         self.current_theme = None
         self.custom_themes = {}
+        # Parsed QColor objects and fonts keyed by theme name
+        self._color_cache: Dict[str, Dict[str, QColor]] = {}
+        self._font_cache: Dict[str, Tuple[QFont, QFont]] = {}
+        # Generated stylesheets keyed by theme name
+        self._stylesheet_cache: Dict[str, str] = {}
+        
+        # Debounced custom theme saving; flush anything pending on exit
+        self._save_pending = False
+        self.app.aboutToQuit.connect(self._flush_themes)
+        
+        # All themes share the Fusion style; setting it restyles every widget
+        self.app.setStyle(QStyleFactory.create("Fusion"))
         self.load_themes()
     
     @property
@@ -221,15 +294,18 @@ class ThemeManager(QObject):
         # Load custom themes
         custom_themes_data = self.settings.value("custom_themes", {})
         if isinstance(custom_themes_data, str):
+            # Older versions stored the themes as a JSON string
             try:
-                custom_themes_data = json.loads(custom_themes_data)
-            except json.JSONDecodeError:
+                custom_themes_data = _loads(custom_themes_data)
+            except ValueError:
                 custom_themes_data = {}
+        if not isinstance(custom_themes_data, dict):
+            custom_themes_data = {}
         
-        self.custom_themes = {}
-        for name, theme_data in custom_themes_data.items():
-            if isinstance(theme_data, dict):
-                self.custom_themes[name] = theme_data
+        self.custom_themes = {
+            name: theme_data for name, theme_data in custom_themes_data.items()
+            if isinstance(theme_data, dict)
+        }
         
         # Set default theme if not set
         current_theme_name = self.settings.value("current_theme", "Dark")
@@ -243,7 +319,21 @@ class ThemeManager(QObject):
             if isinstance(theme, dict):
                 serializable_themes[name] = theme
         
-        self.settings.setValue("custom_themes", json.dumps(serializable_themes))
+        # QSettings stores the dict natively as a QVariantMap
+        self.settings.setValue("custom_themes", serializable_themes)
+        self._save_pending = False
+    
+    def _schedule_save(self):
+        """Save custom themes shortly, coalescing consecutive edits into one write."""
+        if self._save_pending:
+            return
+        self._save_pending = True
+        QTimer.singleShot(250, self._flush_themes)
+    
+    def _flush_themes(self):
+        """Write custom themes if a save is still pending."""
+        if self._save_pending:
+            self.save_themes()
     
     def get_theme(self, name: str) -> Optional[Dict[str, Any]]:
         """
@@ -253,17 +343,28 @@ class ThemeManager(QObject):
             name: Theme name
             
         Returns:
-            Dict containing theme data or None if not found
+            Dict containing an independent copy of the theme data, safe to
+            modify, or None if not found
+        """
+        theme = self._get_theme(name)
+        return _thaw(theme) if theme is not None else None
+    
+    def _get_theme(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored theme data by name without copying it.
+        
+        Args:
+            name: Theme name
+            
+        Returns:
+            Dict containing theme data or None if not found; must not be modified
         """
         # Check built-in themes
         if name in self.BUILTIN_THEMES:
-            return self.BUILTIN_THEMES[name].copy()
+            return self.BUILTIN_THEMES[name]
         
         # Check custom themes
-        if name in self.custom_themes:
-            return self.custom_themes[name].copy()
-        
-        return None
+        return self.custom_themes.get(name)
     
     def add_custom_theme(self, name: str, theme_data: Dict[str, Any]) -> bool:
         """
@@ -276,7 +377,7 @@ class ThemeManager(QObject):
         Returns:
             bool: True if successful, False otherwise
         """
-        if not name or not isinstance(theme_data, dict):
+        if not name or not isinstance(theme_data, Mapping):
             return False
         
         # Ensure required fields exist
@@ -284,12 +385,13 @@ class ThemeManager(QObject):
             return False
         
         # Make a deep copy to avoid reference issues
-        theme_data = theme_data.copy()
+        theme_data = _thaw(theme_data)
         theme_data['name'] = name
         
         # Add to custom themes
         self.custom_themes[name] = theme_data
-        self.save_themes()
+        self._invalidate_theme_cache(name)
+        self._schedule_save()
         return True
     
     def delete_custom_theme(self, name: str) -> bool:
@@ -304,7 +406,8 @@ class ThemeManager(QObject):
         """
         if name in self.custom_themes:
             del self.custom_themes[name]
-            self.save_themes()
+            self._invalidate_theme_cache(name)
+            self._schedule_save()
             
             # If the current theme was deleted, fall back to default
             if self.current_theme == name:
@@ -337,13 +440,14 @@ class ThemeManager(QObject):
         # Remove old and add new
         del self.custom_themes[old_name]
         self.custom_themes[new_name] = theme_data
+        self._invalidate_theme_cache(old_name)
         
         # Update current theme if needed
         if self.current_theme == old_name:
             self.current_theme = new_name
             self.settings.setValue("current_theme", new_name)
         
-        self.save_themes()
+        self._schedule_save()
         return True
     
     def set_theme(self, theme_name: str) -> bool:
@@ -356,7 +460,7 @@ class ThemeManager(QObject):
         Returns:
             bool: True if theme was set, False if not found
         """
-        theme = self.get_theme(theme_name)
+        theme = self._get_theme(theme_name)
         if not theme:
             return False
         
@@ -377,35 +481,17 @@ class ThemeManager(QObject):
         Args:
             theme: Theme data dictionary
         """
-        # Set style
-        self.app.setStyle(QStyleFactory.create("Fusion"))
-        
         # Create palette
         palette = QPalette()
-        colors = theme['colors']
+        colors = self._theme_colors(theme)
         
         # Set colors
-        palette.setColor(QPalette.Window, QColor(colors['window']))
-        palette.setColor(QPalette.WindowText, QColor(colors['window_text']))
-        palette.setColor(QPalette.Base, QColor(colors['base']))
-        palette.setColor(QPalette.AlternateBase, QColor(colors['alternate_base']))
-        palette.setColor(QPalette.ToolTipBase, QColor(colors['tool_tip_base']))
-        palette.setColor(QPalette.ToolTipText, QColor(colors['tool_tip_text']))
-        palette.setColor(QPalette.Text, QColor(colors['text']))
-        palette.setColor(QPalette.Button, QColor(colors['button']))
-        palette.setColor(QPalette.ButtonText, QColor(colors['button_text']))
-        palette.setColor(QPalette.BrightText, QColor(colors['bright_text']))
-        palette.setColor(QPalette.Link, QColor(colors['link']))
-        palette.setColor(QPalette.Highlight, QColor(colors['highlight']))
-        palette.setColor(QPalette.HighlightedText, QColor(colors['highlighted_text']))
+        for role, key in _PALETTE_ROLES:
+            palette.setColor(role, colors[key])
         
         # Disabled colors
-        palette.setColor(QPalette.Disabled, QPalette.WindowText, QColor(colors['disabled_text']))
-        palette.setColor(QPalette.Disabled, QPalette.Button, QColor(colors['disabled_button']))
-        palette.setColor(QPalette.Disabled, QPalette.Highlight, QColor(colors['disabled_highlight']))
-        palette.setColor(QPalette.Disabled, QPalette.HighlightedText, QColor(colors['highlighted_text']))
-        palette.setColor(QPalette.Disabled, QPalette.Text, QColor(colors['disabled_text']))
-        palette.setColor(QPalette.Disabled, QPalette.ButtonText, QColor(colors['disabled_text']))
+        for role, key in _DISABLED_ROLES:
+            palette.setColor(QPalette.Disabled, role, colors[key])
         
         # Set the palette
         self.app.setPalette(palette)
@@ -414,13 +500,59 @@ class ThemeManager(QObject):
         self._set_stylesheet(theme)
         
         # Set font
-        font = QFont(theme['font']['family'], theme['font']['size'])
+        font, fixed_font = self._theme_fonts(theme)
         self.app.setFont(font)
         
         # Set fixed-width font for code
-        fixed_font = QFont(theme['font']['fixed_family'], theme['font']['fixed_size'])
         self.app.setFont(fixed_font, "QTextEdit, QPlainTextEdit, QLineEdit, QListWidget, QTreeView, QTableView")
     
+    def _theme_colors(self, theme: Dict[str, Any]) -> Dict[str, QColor]:
+        """
+        Get the theme's colors as QColor objects, parsing them on first use.
+        
+        Args:
+            theme: Theme data dictionary
+            
+        Returns:
+            Dict mapping color roles to QColor objects
+        """
+        colors = self._color_cache.get(theme['name'])
+        if colors is None:
+            colors = {key: QColor(value) for key, value in theme['colors'].items()}
+            self._color_cache[theme['name']] = colors
+        return colors
+    
+    def _theme_fonts(self, theme: Dict[str, Any]) -> Tuple[QFont, QFont]:
+        """
+        Get the theme's regular and fixed-width fonts, building them on first use.
+        
+        Args:
+            theme: Theme data dictionary
+            
+        Returns:
+            Tuple of (regular font, fixed-width font)
+        """
+        fonts = self._font_cache.get(theme['name'])
+        if fonts is None:
+            font_data = theme['font']
+            fonts = (
+                QFont(font_data['family'], font_data['size']),
+                QFont(font_data['fixed_family'], font_data['fixed_size'])
+            )
+            self._font_cache[theme['name']] = fonts
+        return fonts
+    
+    def _invalidate_theme_cache(self, name: str):
+        """
+        Drop cached objects built for a theme.
+        
+        Args:
+            name: Theme name
+        """
+        self._color_cache.pop(name, None)
+        self._font_cache.pop(name, None)
+        self._stylesheet_cache.pop(name, None)
+    
     def _set_stylesheet(self, theme: Dict[str, Any]):
         """
         Set the application stylesheet based on the theme.
@@ -429,8 +561,11 @@ class ThemeManager(QObject):
             theme: Theme data dictionary
         """
         from . import styles  # Import here to avoid circular imports
-        stylesheet = styles.generate_stylesheet(theme)
-        self.app.setStyleSheet(stylesheet)
+        stylesheet = self._stylesheet_cache.get(theme['name'])
+        if stylesheet is None:
+            stylesheet = styles.generate_stylesheet(theme)
+            self._stylesheet_cache[theme['name']] = stylesheet
+        styles.apply_theme(self.app, theme, stylesheet)
 
     def get_current_theme_data(self) -> Dict[str, Any]:
         """
@@ -441,4 +576,4 @@ class ThemeManager(QObject):
         """
         if not self.current_theme:
             return {}
-        return self.get_theme(self.current_theme) or {}
+        return self._get_theme(self.current_theme) or {}
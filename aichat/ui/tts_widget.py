@@ -1,67 +1,128 @@
 """Text-to-speech widget for converting text to speech."""
 import os
+import queue
 import tempfile
-from pathlib import Path
-from typing import Optional, Callable
+import threading
+from functools import partial
+from typing import Optional, TYPE_CHECKING
 
-from PyQt5.QtCore import QThread, pyqtSignal, Qt, QUrl
+from PyQt5.QtCore import QThread, pyqtSignal, Qt, QUrl, QBuffer, QIODevice
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QPushButton, QLabel, QHBoxLayout, QComboBox, 
     QSlider, QCheckBox
 )
-from PyQt5.QtGui import QIcon
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
 
-from multimodal import MultiModalProcessor
+# QtMultimedia and the multimodal stack are imported when a widget is created
+if TYPE_CHECKING:
+    from multimodal import MultiModalProcessor
+
+# (display name, language code) pairs offered for speech
+_LANGS = (
+    ("English", "en"),
+    ("Spanish", "es"),
+    ("French", "fr"),
+    ("German", "de"),
+    ("Italian", "it"),
+    ("Japanese", "ja"),
+    ("Chinese", "zh"),
+    ("Russian", "ru"),
+    ("Arabic", "ar"),
+)
+
+
+# Stopped workers whose conversion is still running; kept referenced until
+# Qt deletes them, so one is never destroyed while its thread runs
+_stopping_workers = set()
 
 
-class TTSThread(QThread):
-    """Thread for handling text-to-speech conversion."""
-    finished = pyqtSignal(str, bool)  # audio_path, success
-    
-    def __init__(
-        self, 
-        text: str, 
-        processor: MultiModalProcessor, 
-        language: str = 'en',
-        speed: float = 1.0,
-        use_cloud: bool = False
-    ):
+class TTSWorker(QThread):
+    """Long-lived thread that converts queued text to speech.
+    
+    Only the most recent request is kept: submitting new text replaces any
+    job that has not started yet, and each job carries a generation number
+    so the result of one superseded while running is dropped instead of
+    played.
+    """
+    converted = pyqtSignal(object, bool)  # MP3 bytes, audio path or error message; success
+    
+    def __init__(self, processor: 'MultiModalProcessor', output_path: Optional[str] = None):
         super().__init__()
-        self.text = text
         self.processor = processor
-        self.language = language
-        self.speed = speed
-        self.use_cloud = use_cloud
-        self.output_path = None
+        self.output_path = output_path
+        self._queue = queue.Queue(maxsize=1)
+        self._lock = threading.Lock()
+        self._generation = 0
+    
+    def submit(self, text: str, language: str = 'en', speed: float = 1.0, use_cloud: bool = False):
+        """Queue text for conversion, replacing any pending request.
         
+        Args:
+            text: The text to convert to speech
+            language: Language code
+            speed: Playback speed multiplier
+            use_cloud: Whether to prefer a cloud TTS service
+        """
+        with self._lock:
+            self._generation += 1
+            self._put_latest((self._generation, (text, language, speed, use_cloud)))
+    
+    def stop(self):
+        """Cancel any work and let the thread exit without waiting for it.
+        
+        A conversion already under way cannot be interrupted; its result is
+        dropped and the thread deletes itself once the conversion returns.
+        """
+        with self._lock:
+            self._generation += 1
+            self._put_latest(None)
+        if self.isRunning():
+            _stopping_workers.add(self)
+            self.finished.connect(self.deleteLater)
+            self.destroyed.connect(partial(_stopping_workers.discard, self))
+    
+    def _put_latest(self, job):
+        """Replace the pending job with a new one."""
+        try:
+            self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._queue.put(job)
+    
     def run(self):
-        """Convert text to speech and save to a temporary file."""
+        """Process jobs until stop() is called."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            generation, job = item
+            audio, success = self._convert(*job)
+            # Drop the result if a newer request or stop() came in meanwhile
+            if generation == self._generation:
+                self.converted.emit(audio, success)
+    
+    def _convert(self, text: str, language: str, speed: float, use_cloud: bool):
+        """Convert text to speech, in memory if the processor supports it."""
         try:
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp_file:
-                output_path = tmp_file.name
+            if hasattr(self.processor, 'text_to_speech_bytes'):
+                audio = self.processor.text_to_speech_bytes(text=text, lang=language)
+                return audio, isinstance(audio, bytes)
             
-            # Convert text to speech
+            # Fall back to writing the widget's scratch file
             result_path = self.processor.text_to_speech(
-                text=self.text,
-                output_path=output_path,
-                lang=self.language
+                text=text,
+                output_path=self.output_path,
+                lang=language
             )
-            
-            if result_path.startswith("Error"):
-                self.finished.emit(result_path, False)
-            else:
-                self.output_path = result_path
-                self.finished.emit(result_path, True)
+            return result_path, not result_path.startswith("Error")
                 
         except Exception as e:
-            self.finished.emit(f"Error in text-to-speech: {str(e)}", False)
+            return f"Error in text-to-speech: {str(e)}", False
 
 
 class TTSWidget(QWidget):
     """Widget for text-to-speech functionality."""
     
-    def __init__(self, parent=None, processor: Optional[MultiModalProcessor] = None):
+    def __init__(self, parent=None, processor: Optional['MultiModalProcessor'] = None):
         """Initialize the TTS widget.
         
         Args:
@@ -69,10 +130,24 @@ class TTSWidget(QWidget):
             processor: MultiModalProcessor instance for TTS
         """
         super().__init__(parent)
-        self.processor = processor or MultiModalProcessor()
+        from PyQt5.QtMultimedia import QMediaPlayer
+        if processor is None:
+            from multimodal import MultiModalProcessor
+            processor = MultiModalProcessor()
+        self.processor = processor
         self.media_player = QMediaPlayer()
         self.current_audio_path = None
-        self.tts_thread = None
+        # In-memory audio source, reused for every utterance
+        self._audio_buffer = QBuffer(self)
+        
+        # One scratch file reused for every file-based conversion
+        fd, self._scratch_path = tempfile.mkstemp(suffix='.mp3')
+        os.close(fd)
+        
+        # Single background thread serving every conversion
+        self.tts_worker = TTSWorker(self.processor, self._scratch_path)
+        self.tts_worker.converted.connect(self.on_tts_finished)
+        self.tts_worker.start()
         
         # UI Setup
         self.init_ui()
@@ -90,15 +165,9 @@ class TTSWidget(QWidget):
         lang_layout.addWidget(QLabel("Language:"))
         
         self.language_combo = QComboBox()
-        self.language_combo.addItem("English", "en")
-        self.language_combo.addItem("Spanish", "es")
-        self.language_combo.addItem("French", "fr")
-        self.language_combo.addItem("German", "de")
-        self.language_combo.addItem("Italian", "it")
-        self.language_combo.addItem("Japanese", "ja")
-        self.language_combo.addItem("Chinese", "zh")
-        self.language_combo.addItem("Russian", "ru")
-        self.language_combo.addItem("Arabic", "ar")
+        self.language_combo.addItems([name for name, _ in _LANGS])
+        for index, (_, code) in enumerate(_LANGS):
+            self.language_combo.setItemData(index, code)
         lang_layout.addWidget(self.language_combo)
         
         # Speed control
@@ -111,8 +180,11 @@ class TTSWidget(QWidget):
         self.speed_slider.setTickPosition(QSlider.TicksBelow)
         self.speed_slider.setTickInterval(25)
         
+        # Label text for every slider position, formatted once
+        self._speed_labels = [f"{value / 100:.1f}x" for value in range(50, 201)]
         self.speed_label = QLabel("1.0x")
         self.speed_slider.valueChanged.connect(self.on_speed_changed)
+        self.speed_slider.sliderReleased.connect(self._apply_playback_rate)
         
         speed_layout.addWidget(self.speed_slider)
         speed_layout.addWidget(self.speed_label)
@@ -121,11 +193,14 @@ class TTSWidget(QWidget):
         self.cloud_tts_check = QCheckBox("Use Cloud TTS (if available)")
         self.cloud_tts_check.setChecked(False)
         
+        # Play/pause icons, resolved once
+        style = self.style()
+        self._icon_play = style.standardIcon(style.SP_MediaPlay)
+        self._icon_pause = style.standardIcon(style.SP_MediaPause)
+        
         # Play button
         self.play_button = QPushButton("Speak")
-        self.play_button.setIcon(self.style().standardIcon(
-            getattr(self.style(), 'SP_MediaPlay')
-        ))
+        self.play_button.setIcon(self._icon_play)
         self.play_button.clicked.connect(self.toggle_playback)
         
         # Status label
@@ -152,82 +227,94 @@ class TTSWidget(QWidget):
         self.current_text = text
         self.status_label.setText("Converting to speech...")
         
-        # Start TTS in a separate thread
-        if self.tts_thread and self.tts_thread.isRunning():
-            self.tts_thread.terminate()
-            self.tts_thread.wait()
+        # Release the scratch file before it is overwritten (needed on Windows)
+        from PyQt5.QtMultimedia import QMediaContent
+        self.media_player.stop()
+        self.media_player.setMedia(QMediaContent())
             
-        self.tts_thread = TTSThread(
+        # Hand the text to the background worker
+        self.tts_worker.submit(
             text=text,
-            processor=self.processor,
             language=self.language_combo.currentData(),
             speed=self.speed_slider.value() / 100.0,
             use_cloud=self.cloud_tts_check.isChecked()
         )
-        self.tts_thread.finished.connect(self.on_tts_finished)
-        self.tts_thread.start()
     
     def toggle_playback(self):
         """Toggle playback of the current audio."""
-        if self.media_player.state() == QMediaPlayer.PlayingState:
+        if self.media_player.state() == self.media_player.PlayingState:
             self.media_player.pause()
-            self.play_button.setIcon(self.style().standardIcon(
-                getattr(self.style(), 'SP_MediaPlay')
-            ))
+            self.play_button.setIcon(self._icon_play)
         else:
-            if self.current_audio_path and os.path.exists(self.current_audio_path):
+            if self._audio_buffer.size() > 0 or (
+                self.current_audio_path and os.path.exists(self.current_audio_path)
+            ):
                 self.media_player.play()
-                self.play_button.setIcon(self.style().standardIcon(
-                    getattr(self.style(), 'SP_MediaPause')
-                ))
+                self.play_button.setIcon(self._icon_pause)
     
-    def on_tts_finished(self, audio_path: str, success: bool):
-        """Handle completion of TTS conversion."""
+    def on_tts_finished(self, audio, success: bool):
+        """Handle completion of TTS conversion.
+        
+        Args:
+            audio: MP3 data or path to an MP3 file, or an error message on failure
+            success: Whether the conversion succeeded
+        """
         if success:
-            self.current_audio_path = audio_path
-            self.media_player.setMedia(QMediaContent(QUrl.fromLocalFile(audio_path)))
+            from PyQt5.QtMultimedia import QMediaContent
+            if isinstance(audio, bytes):
+                # Play straight from memory, refilling the shared buffer
+                self._audio_buffer.close()
+                self._audio_buffer.setData(audio)
+                self._audio_buffer.open(QIODevice.ReadOnly)
+                self.media_player.setMedia(QMediaContent(), self._audio_buffer)
+            else:
+                self.current_audio_path = audio
+                self.media_player.setMedia(QMediaContent(QUrl.fromLocalFile(audio)))
             self.media_player.play()
-            self.play_button.setIcon(self.style().standardIcon(
-                getattr(self.style(), 'SP_MediaPause')
-            ))
+            self.play_button.setIcon(self._icon_pause)
             self.status_label.setText("Playing...")
         else:
-            self.status_label.setText(audio_path)  # Show error message
+            self.status_label.setText(audio)  # Show error message
     
     def on_media_state_changed(self, state):
         """Handle media player state changes."""
-        if state == QMediaPlayer.StoppedState:
-            self.play_button.setIcon(self.style().standardIcon(
-                getattr(self.style(), 'SP_MediaPlay')
-            ))
+        if state == self.media_player.StoppedState:
+            self.play_button.setIcon(self._icon_play)
             self.status_label.setText("Ready")
     
     def on_speed_changed(self, value):
         """Handle speed slider value changes."""
-        speed = value / 100.0
-        self.speed_label.setText(f"{speed:.1f}x")
+        self.speed_label.setText(self._speed_labels[value - 50])
         
-        # Update media player rate if supported
+        # While dragging, wait for the release instead of reconfiguring the
+        # backend on every tick; keyboard and wheel changes apply at once
+        if not self.speed_slider.isSliderDown():
+            self._apply_playback_rate()
+    
+    def _apply_playback_rate(self):
+        """Apply the slider's speed to the media player if supported."""
         if hasattr(self.media_player, 'setPlaybackRate'):
-            self.media_player.setPlaybackRate(speed)
+            self.media_player.setPlaybackRate(self.speed_slider.value() / 100.0)
     
-    def set_processor(self, processor: MultiModalProcessor):
+    def set_processor(self, processor: 'MultiModalProcessor'):
         """Set the MultiModalProcessor instance to use.
         
         Args:
             processor: MultiModalProcessor instance
         """
         self.processor = processor
+        self.tts_worker.processor = processor
     
     def cleanup(self):
         """Clean up resources."""
-        if self.tts_thread and self.tts_thread.isRunning():
-            self.tts_thread.terminate()
-            self.tts_thread.wait()
+        if self.tts_worker.isRunning():
+            self.tts_worker.stop()
             
-        if hasattr(self, 'current_audio_path') and self.current_audio_path:
+        for path in {self._scratch_path, self.current_audio_path}:
+            if not path:
+                continue
             try:
-                if os.path.exists(self.current_audio_path):
-                    os.unlink(self.current_audio_path)
+                if os.path.exists(path):
+                    os.unlink(path)
             except Exception:
                 pass
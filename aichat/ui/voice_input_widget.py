@@ -1,52 +1,116 @@
 """Voice input/output widget for speech-to-text and text-to-speech functionality."""
-import os
-import tempfile
+import queue
+import time
 from pathlib import Path
 from typing import Optional, Callable
 
-from PyQt5.QtCore import QThread, pyqtSignal, Qt, QTimer
+import speech_recognition as sr
+from PyQt5.QtCore import (
+    QThread, pyqtSignal, Qt, QPropertyAnimation, QEasingCurve
+)
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QPushButton, QLabel, QHBoxLayout, QProgressBar
+    QWidget, QVBoxLayout, QPushButton, QLabel, QHBoxLayout, QProgressBar, QStyle
 )
 from PyQt5.QtGui import QIcon, QPixmap, QColor
 
 from multimodal import MultiModalProcessor
 
+# 16 kHz mono is what the recognizer works with, so nothing gets resampled,
+# and a 512-frame buffer lets the end of a phrase be detected sooner than
+# PyAudio's default 1024
+SAMPLE_RATE = 16000
+CHUNK_SIZE = 512
+
+
+def _open_microphone() -> sr.Microphone:
+    """Create the microphone source used for calibration and recording."""
+    return sr.Microphone(sample_rate=SAMPLE_RATE, chunk_size=CHUNK_SIZE)
+
+
+class AmbientCalibrationThread(QThread):
+    """Thread that measures ambient noise once to set the energy threshold."""
+    calibrated = pyqtSignal(bool)  # success
+    
+    def __init__(self, processor: MultiModalProcessor, duration: float = 0.5):
+        super().__init__()
+        self.processor = processor
+        self.duration = duration
+    
+    def run(self):
+        """Calibrate the recognizer against the current ambient noise."""
+        try:
+            with _open_microphone() as source:
+                self.processor.recognizer.adjust_for_ambient_noise(source, duration=self.duration)
+            self.calibrated.emit(True)
+        except Exception:
+            self.calibrated.emit(False)
+
 
 class VoiceInputThread(QThread):
-    """Thread for handling voice input processing."""
+    """Thread for handling voice input processing.
+    
+    Audio is captured by a background listener, so a stop request is seen
+    within a tenth of a second instead of after the phrase. The session ends
+    as soon as the first phrase ends, which the recognizer detects from its
+    pause threshold, and that phrase is then recognized.
+    """
     finished = pyqtSignal(str, bool)  # text, success
     
-    def __init__(self, processor: MultiModalProcessor, language: str = 'en-US'):
+    PHRASE_TIME_LIMIT = 10  # Longest phrase captured before it is recognized
+    LISTEN_TIMEOUT = 15  # Give up if no phrase has ended after this many seconds
+    
+    def __init__(self, processor: MultiModalProcessor, language: str = 'en-US',
+                 calibrate: bool = True):
         super().__init__()
         self.processor = processor
         self.language = language
+        self.calibrate = calibrate
         self.is_recording = False
         self.stop_requested = False
         
     def run(self):
         """Run the voice recognition in a separate thread."""
+        recognizer = self.processor.recognizer
+        phrases = queue.Queue()
+        stop_listening = None
+        
         try:
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-                temp_path = tmp_file.name
+            source = _open_microphone()
+            # The threshold is normally calibrated once up front; only pay
+            # the 0.5s measurement here when that has not happened yet.
+            if self.calibrate:
+                with source:
+                    recognizer.adjust_for_ambient_noise(source, duration=0.5)
             
             # Record audio
             self.is_recording = True
-            with sr.Microphone() as source:
-                self.processor.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                audio = self.processor.recognizer.listen(source, timeout=5, phrase_time_limit=10)
+            audio = None
+            if not self.stop_requested:
+                stop_listening = recognizer.listen_in_background(
+                    source, lambda _, phrase: phrases.put(phrase),
+                    phrase_time_limit=self.PHRASE_TIME_LIMIT
+                )
+                deadline = time.monotonic() + self.LISTEN_TIMEOUT
+                while not self.stop_requested and time.monotonic() < deadline:
+                    try:
+                        audio = phrases.get(timeout=0.1)
+                        break
+                    except queue.Empty:
+                        continue
                 
-                if self.stop_requested:
-                    self.finished.emit("", False)
-                    return
-                    
-                # Save audio to temporary file
-                with open(temp_path, "wb") as f:
-                    f.write(audio.get_wav_data())
+                # Release the microphone before the network round trip
+                stop_listening(wait_for_stop=True)
+                stop_listening = None
             
-            # Convert speech to text
-            text = self.processor.speech_to_text(temp_path, self.language)
-            os.unlink(temp_path)  # Clean up temp file
+            if self.stop_requested:
+                self.finished.emit("", False)
+                return
+            if audio is None:
+                self.finished.emit("Error: No speech detected", False)
+                return
+            
+            # Recognize straight from the captured audio; no temp WAV on disk
+            text = self.processor.speech_to_text_bytes(audio, self.language)
             
             if text.startswith("Error"):
                 self.finished.emit(text, False)
@@ -56,12 +120,17 @@ class VoiceInputThread(QThread):
         except Exception as e:
             self.finished.emit(f"Error during voice recognition: {str(e)}", False)
         finally:
+            if stop_listening:
+                stop_listening(wait_for_stop=False)
             self.is_recording = False
     
     def stop(self):
-        """Stop the recording process."""
-        if self.is_recording:
-            self.stop_requested = True
+        """Stop the recording process.
+        
+        Also honoured while the thread is still calibrating, before recording
+        has started.
+        """
+        self.stop_requested = True
 
 
 class VoiceInputWidget(QWidget):
@@ -83,14 +152,37 @@ class VoiceInputWidget(QWidget):
         self.language = language
         self.recording_thread = None
         self.is_recording = False
+        self._calibrated = False
+        self.calibration_thread = None
         
         # UI Setup
         self.init_ui()
         
-        # Animation timer for recording indicator
-        self.animation_timer = QTimer(self)
-        self.animation_timer.timeout.connect(self.update_recording_animation)
-        self.animation_frame = 0
+        # Looping wave on the level meter while recording; Qt drives the
+        # frames so no Python callback runs per tick
+        self.level_anim = QPropertyAnimation(self.level_meter, b"value", self)
+        self.level_anim.setDuration(1000)
+        self.level_anim.setKeyValueAt(0.0, 100)
+        self.level_anim.setKeyValueAt(0.5, 0)
+        self.level_anim.setKeyValueAt(1.0, 100)
+        self.level_anim.setEasingCurve(QEasingCurve.InOutSine)
+        self.level_anim.setLoopCount(-1)
+        
+        # Measure ambient noise in the background so the first recording
+        # does not stall on it
+        self.recalibrate()
+    
+    def recalibrate(self):
+        """Re-measure ambient noise and update the recognizer's threshold."""
+        if self.calibration_thread and self.calibration_thread.isRunning():
+            return
+        self.calibration_thread = AmbientCalibrationThread(self.processor)
+        self.calibration_thread.calibrated.connect(self._on_calibrated)
+        self.calibration_thread.start()
+    
+    def _on_calibrated(self, success: bool):
+        """Remember whether the ambient noise calibration succeeded."""
+        self._calibrated = success
     
     def init_ui(self):
         """Initialize the user interface."""
@@ -100,11 +192,13 @@ class VoiceInputWidget(QWidget):
         # Main button layout
         button_layout = QHBoxLayout()
         
+        # Icons for the two recording states, looked up once
+        self._play_icon = self.style().standardIcon(QStyle.SP_MediaPlay)
+        self._stop_icon = self.style().standardIcon(QStyle.SP_MediaStop)
+        
         # Voice input button
         self.voice_button = QPushButton()
-        self.voice_button.setIcon(self.style().standardIcon(
-            getattr(self.style(), 'SP_MediaPlay')
-        ))
+        self.voice_button.setIcon(self._play_icon)
         self.voice_button.setToolTip("Start/Stop Voice Input")
         self.voice_button.setFixedSize(40, 40)
         self.voice_button.setCheckable(True)
@@ -141,16 +235,23 @@ class VoiceInputWidget(QWidget):
         """Start voice input recording."""
         if self.is_recording:
             return
+        # A stopped recording still finishes in the background; wait for it
+        if self.recording_thread and self.recording_thread.isRunning():
+            self.voice_button.setChecked(False)
+            return
             
         self.is_recording = True
         self.set_recording_state(True)
         
         # Start animation
-        self.animation_frame = 0
-        self.animation_timer.start(100)  # Update every 100ms
+        self.level_anim.start()
         
         # Start recording in a separate thread
-        self.recording_thread = VoiceInputThread(self.processor, self.language)
+        if self.calibration_thread and self.calibration_thread.isRunning():
+            self.calibration_thread.wait()
+        self.recording_thread = VoiceInputThread(
+            self.processor, self.language, calibrate=not self._calibrated
+        )
         self.recording_thread.finished.connect(self.on_voice_input_finished)
         self.recording_thread.start()
     
@@ -160,22 +261,27 @@ class VoiceInputWidget(QWidget):
             return
             
         # Stop animation
-        self.animation_timer.stop()
+        self.level_anim.stop()
         self.level_meter.setValue(0)
         
-        # Stop the recording thread
+        # Ask the recording thread to stop; it reports back through its
+        # finished signal, so the GUI thread never blocks on it
         if self.recording_thread.isRunning():
             self.recording_thread.stop()
-            self.recording_thread.wait()
         
         self.set_recording_state(False)
+        self.status_label.setText("Stopping...")
     
     def on_voice_input_finished(self, text: str, success: bool):
         """Handle completion of voice input processing."""
-        self.animation_timer.stop()
+        self.level_anim.stop()
         self.level_meter.setValue(0)
         self.set_recording_state(False)
         
+        # A successful recording has calibrated the threshold by now
+        if success:
+            self._calibrated = True
+        
         if success and text:
             self.voice_input_received.emit(text)
             self.status_label.setText("Voice input received")
@@ -189,31 +295,17 @@ class VoiceInputWidget(QWidget):
         """Update UI elements based on recording state."""
         self.is_recording = recording
         
+        self.voice_button.setIcon(self._stop_icon if recording else self._play_icon)
+        
         if recording:
-            self.voice_button.setIcon(self.style().standardIcon(
-                getattr(self.style(), 'SP_MediaStop')
-            ))
             self.voice_button.setToolTip("Stop Recording")
             self.status_label.setText("Listening...")
             self.status_label.setStyleSheet("color: #ff6b6b;")
         else:
-            self.voice_button.setIcon(self.style().standardIcon(
-                getattr(self.style(), 'SP_MediaPlay')
-            ))
             self.voice_button.setToolTip("Start Voice Input")
             self.status_label.setText("Tap to speak")
             self.status_label.setStyleSheet("")
     
-    def update_recording_animation(self):
-        """Update the recording animation."""
-        if not self.is_recording:
-            return
-            
-        # Simple animation: cycle through different levels
-        self.animation_frame = (self.animation_frame + 1) % 10
-        level = abs(5 - self.animation_frame) * 20  # 0-100 in a wave pattern
-        self.level_meter.setValue(level)
-    
     def set_language(self, language: str):
         """Set the language for speech recognition.
         
@@ -4,18 +4,33 @@ API key management with validation and secure storage.
 import os
 import json
 import base64
+import hashlib
 import logging
+from functools import cached_property
 from pathlib import Path
 from typing import Optional, Dict, Any
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import requests
 
+try:
+    import keyring
+    from keyring.errors import KeyringError, PasswordDeleteError
+    HAS_KEYRING = True
+except ImportError:
+    HAS_KEYRING = False
+
 logger = logging.getLogger(__name__)
 
+# Service name the keys are filed under in the OS credential store
+KEYRING_SERVICE = "pashto_ai"
+
 class APIKeyManager:
-    """Manages API keys with secure storage and validation."""
+    """Manages API keys with secure storage and validation.
+    
+    Keys live in the OS credential store (Keychain, Windows Credential
+    Locker, Secret Service) when ``keyring`` is installed and a backend is
+    available. Otherwise they fall back to a Fernet-encrypted JSON file.
+    """
     
     def __init__(self, config_dir: Optional[str] = None):
         """Initialize the API key manager.
@@ -29,31 +44,42 @@ class APIKeyManager:
         self.config_dir = config_dir
         os.makedirs(self.config_dir, exist_ok=True)
         
-        # Derive a key from the system username for encryption
-        self.encryption_key = self._derive_key()
         self.keys_file = os.path.join(self.config_dir, "api_keys.enc")
+        # Contents of keys_file, loaded on first use
+        self._keys_cache: Optional[Dict[str, str]] = None
+        # Cleared the first time the keyring backend fails
+        self._use_keyring = HAS_KEYRING
+    
+    def _keyring_failed(self, error: Exception) -> None:
+        """Fall back to the encrypted file after a keyring backend error."""
+        logger.warning(f"Keyring unavailable, using encrypted file: {error}")
+        self._use_keyring = False
+    
+    @cached_property
+    def encryption_key(self) -> bytes:
+        """Encryption key, derived from the system username on first use."""
+        return self._derive_key()
+    
+    @cached_property
+    def _fernet(self) -> Fernet:
+        """Cipher shared by _encrypt and _decrypt."""
+        return Fernet(self.encryption_key)
     
     def _derive_key(self) -> bytes:
         """Derive an encryption key from the system username."""
         # Use the username as salt - this is just to make it harder to decrypt without the key
         salt = os.environ.get("USERNAME", "default_salt").encode()
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        return base64.urlsafe_b64encode(kdf.derive(b"pashto_ai_encryption_key"))
+        # hashlib runs PBKDF2 inside OpenSSL, which uses the CPU's SHA extensions
+        key = hashlib.pbkdf2_hmac("sha256", b"pashto_ai_encryption_key", salt, 100000, dklen=32)
+        return base64.urlsafe_b64encode(key)
     
     def _encrypt(self, data: str) -> str:
         """Encrypt the given data."""
-        f = Fernet(self.encryption_key)
-        return f.encrypt(data.encode()).decode()
+        return self._fernet.encrypt(data.encode()).decode()
     
     def _decrypt(self, token: str) -> str:
         """Decrypt the given token."""
-        f = Fernet(self.encryption_key)
-        return f.decrypt(token.encode()).decode()
+        return self._fernet.decrypt(token.encode()).decode()
     
     @staticmethod
     def validate_api_key_format(key: str) -> bool:
@@ -85,6 +111,19 @@ class APIKeyManager:
             logger.warning("Invalid API key format")
             return False
             
+        if self._use_keyring:
+            try:
+                keyring.set_password(KEYRING_SERVICE, service, key)
+            except KeyringError as e:
+                self._keyring_failed(e)
+            else:
+                # Do not leave a stale encrypted copy behind on disk
+                try:
+                    self._remove_file_key(service)
+                except OSError as e:
+                    logger.warning(f"Failed to remove old API key from file: {e}")
+                return True
+            
         try:
             # Load existing keys
             keys = self.load_all_keys()
@@ -92,8 +131,7 @@ class APIKeyManager:
             keys[service] = self._encrypt(key)
             
             # Save back to file
-            with open(self.keys_file, 'w', encoding='utf-8') as f:
-                json.dump(keys, f)
+            self._write_keys(keys)
                 
             return True
         except Exception as e:
@@ -109,11 +147,23 @@ class APIKeyManager:
         Returns:
             str: The decrypted API key, or None if not found or error
         """
+        if self._use_keyring:
+            try:
+                key = keyring.get_password(KEYRING_SERVICE, service)
+                if key is not None:
+                    return key
+            except KeyringError as e:
+                self._keyring_failed(e)
+            
         try:
             keys = self.load_all_keys()
             encrypted_key = keys.get(service)
             if encrypted_key:
-                return self._decrypt(encrypted_key)
+                key = self._decrypt(encrypted_key)
+                # Move keys saved before keyring was available into it
+                if self._use_keyring:
+                    self.save_api_key(service, key)
+                return key
             return None
         except Exception as e:
             logger.error(f"Failed to get API key: {e}")
@@ -125,15 +175,29 @@ class APIKeyManager:
         Returns:
             dict: Dictionary of service names to encrypted keys
         """
-        if not os.path.exists(self.keys_file):
-            return {}
-            
-        try:
-            with open(self.keys_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, OSError) as e:
-            logger.error(f"Failed to load API keys: {e}")
-            return {}
+        if self._keys_cache is None:
+            if not os.path.exists(self.keys_file):
+                return {}
+                
+            try:
+                with open(self.keys_file, 'r', encoding='utf-8') as f:
+                    self._keys_cache = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                logger.error(f"Failed to load API keys: {e}")
+                return {}
+        return dict(self._keys_cache)
+    
+    def _write_keys(self, keys: Dict[str, str]) -> None:
+        """Atomically replace the keys file and update the in-memory copy.
+        
+        Args:
+            keys: Dictionary of service names to encrypted keys
+        """
+        tmp_file = self.keys_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(keys, f)
+        os.replace(tmp_file, self.keys_file)
+        self._keys_cache = keys
     
     def delete_api_key(self, service: str) -> bool:
         """Delete an API key.
@@ -144,17 +208,37 @@ class APIKeyManager:
         Returns:
             bool: True if the key was deleted, False otherwise
         """
+        deleted = False
+        if self._use_keyring:
+            try:
+                keyring.delete_password(KEYRING_SERVICE, service)
+                deleted = True
+            except PasswordDeleteError:
+                pass
+            except KeyringError as e:
+                self._keyring_failed(e)
+            
         try:
-            keys = self.load_all_keys()
-            if service in keys:
-                del keys[service]
-                with open(self.keys_file, 'w', encoding='utf-8') as f:
-                    json.dump(keys, f)
-                return True
-            return False
+            return self._remove_file_key(service) or deleted
         except Exception as e:
             logger.error(f"Failed to delete API key: {e}")
+            return deleted
+    
+    def _remove_file_key(self, service: str) -> bool:
+        """Remove a key from the encrypted file if it is stored there.
+        
+        Args:
+            service: The service name
+            
+        Returns:
+            bool: True if the file held a key for the service
+        """
+        keys = self.load_all_keys()
+        if service not in keys:
             return False
+        del keys[service]
+        self._write_keys(keys)
+        return True
 
 
 def test_api_key(api_key: str, service: str = "openrouter") -> (bool, str):
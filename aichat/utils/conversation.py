@@ -4,12 +4,76 @@ Conversation management for saving and loading chat sessions.
 import json
 import os
 import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from pathlib import Path
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
 logger = logging.getLogger(__name__)
 
+# Top-level fields copied into the metadata index
+_METADATA_FIELDS = ('id', 'title', 'created_at', 'updated_at')
+_SCALAR_EVENTS = frozenset({'string', 'number', 'boolean', 'null', 'start_map', 'start_array'})
+
+# Index of conversation metadata, one row per conversation file
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    message_count INTEGER,
+    path TEXT
+)
+"""
+_INDEX_UPSERT = """
+INSERT OR REPLACE INTO conversations (id, title, created_at, updated_at, message_count, path)
+VALUES (:id, :title, :created_at, :updated_at, :message_count, :path)
+"""
+# JSON index written by earlier versions
+_LEGACY_INDEX = "_index.json"
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    """Serialize conversation data to indented UTF-8 JSON."""
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse UTF-8 JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _atomic_write(path: Path, payload: bytes) -> None:
+    """Write a file via a temporary sibling so readers never see a partial file.
+    
+    No fsync is issued; chat history does not need durability across power loss.
+    """
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
 class ConversationManager:
     """Manages saving and loading conversation history."""
     
@@ -21,6 +85,14 @@ class ConversationManager:
         """
         self.save_dir = Path(save_dir)
         self.save_dir.mkdir(parents=True, exist_ok=True)
+        # SQLite index with the metadata of every conversation, opened on demand
+        self.index_path = self.save_dir / "_index.db"
+        self._index_db: Optional[sqlite3.Connection] = None
+        self._index_lock = threading.RLock()
+        # Result of the last listing, cleared whenever the index changes
+        self._cached_list: Optional[List[Dict[str, Any]]] = None
+        # Worker pool for reading many conversation files at once, created on demand
+        self._executor: Optional[ThreadPoolExecutor] = None
     
     def get_conversation_path(self, conversation_id: str) -> Path:
         """Get the full path for a conversation file."""
@@ -43,26 +115,38 @@ class ConversationManager:
             str: The conversation ID
         """
         if conversation_id is None:
-            conversation_id = f"conv_{int(datetime.now().timestamp())}"
+            # Nanosecond resolution keeps IDs unique for saves within the same second
+            conversation_id = f"conv_{time.time_ns()}"
         
         if title is None:
             # Generate a title from the first user message
-            user_messages = [m for m in messages if m.get('role') == 'user']
-            title = user_messages[0]['content'][:50] + ('...' if len(user_messages[0]['content']) > 50 else '') if user_messages else 'New Chat'
+            first = next((m for m in messages if m.get('role') == 'user'), None)
+            if first is None:
+                title = 'New Chat'
+            else:
+                content = first['content']
+                title = content[:50] + '...' if len(content) > 50 else content
         
+        now_iso = datetime.now().isoformat()
         data = {
             'id': conversation_id,
             'title': title,
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat(),
+            'created_at': now_iso,
+            'updated_at': now_iso,
             'messages': messages
         }
         
         file_path = self.get_conversation_path(conversation_id)
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            _atomic_write(file_path, _dumps(data))
             logger.info(f"Saved conversation to {file_path}")
+            
+            record = self._metadata(data, file_path)
+            self._cached_list = None
+            try:
+                self._run_index(lambda db: db.execute(_INDEX_UPSERT, record))
+            except sqlite3.Error as e:
+                logger.error(f"Error updating conversation index: {e}")
             return conversation_id
         except Exception as e:
             logger.error(f"Error saving conversation: {e}")
@@ -79,8 +163,8 @@ class ConversationManager:
         """
         file_path = self.get_conversation_path(conversation_id)
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(file_path, 'rb') as f:
+                return _loads(f.read())
         except Exception as e:
             logger.error(f"Error loading conversation {conversation_id}: {e}")
             raise
@@ -91,28 +175,170 @@ class ConversationManager:
         Returns:
             List of conversation metadata dictionaries
         """
-        conversations = []
-        for file_path in self.save_dir.glob('*.json'):
+        if self._cached_list is None:
+            # Sort by last updated (newest first)
+            rows = self._run_index(lambda db: db.execute(
+                "SELECT * FROM conversations ORDER BY updated_at DESC"
+            ).fetchall())
+            self._cached_list = [dict(row) for row in rows]
+        return [dict(conv) for conv in self._cached_list]
+    
+    def sync_index(self) -> bool:
+        """Pick up conversation files added or removed outside this manager.
+        
+        Only the directory listing is compared with the index; files that
+        are new to it are read, and rows whose file is gone are dropped.
+        
+        Returns:
+            bool: True if the index changed
+        """
+        return self._run_index(self._sync_with_files)
+    
+    def _sync_with_files(self, db: sqlite3.Connection) -> bool:
+        """Bring an open index in line with the conversation files on disk."""
+        file_paths = {
+            str(p): p for p in self.save_dir.glob('*.json') if p.name != _LEGACY_INDEX
+        }
+        indexed = {
+            row['path'] for row in db.execute("SELECT path FROM conversations").fetchall()
+        }
+        removed = [(path,) for path in indexed - file_paths.keys()]
+        added = [
+            record for record in (
+                self._try_read_metadata(file_paths[path])
+                for path in file_paths.keys() - indexed
+            ) if record is not None
+        ]
+        if not removed and not added:
+            return False
+        
+        db.executemany("DELETE FROM conversations WHERE path = ?", removed)
+        db.executemany(_INDEX_UPSERT, added)
+        self._cached_list = None
+        return True
+    
+    @staticmethod
+    def _metadata(
+        data: Dict[str, Any],
+        file_path: Path,
+        message_count: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Build the index record for a conversation."""
+        if message_count is None:
+            message_count = len(data.get('messages', []))
+        return {
+            'id': data.get('id', file_path.stem),
+            'title': data.get('title', 'Untitled'),
+            'created_at': data.get('created_at'),
+            'updated_at': data.get('updated_at'),
+            'message_count': message_count,
+            'path': str(file_path)
+        }
+    
+    def _run_index(self, operation: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run an operation against the index inside a transaction.
+        
+        An unreadable index file is deleted and rebuilt once from the
+        conversation files before the operation is retried.
+        """
+        with self._index_lock:
+            try:
+                db = self._connect_index()
+                with db:
+                    return operation(db)
+            except sqlite3.OperationalError:
+                # Locked or out of space; the file itself is fine
+                raise
+            except sqlite3.DatabaseError as e:
+                logger.warning(f"Rebuilding unreadable conversation index: {e}")
+                self.close()
+                self.index_path.unlink(missing_ok=True)
+                db = self._connect_index()
+                with db:
+                    return operation(db)
+    
+    def _connect_index(self) -> sqlite3.Connection:
+        """Open the index, rebuilding it from the conversation files if it is missing.
+        
+        An index left by an earlier session is synced with the save directory
+        when it is opened, since files may have changed while it was closed.
+        """
+        if self._index_db is not None and not self.index_path.exists():
+            self.close()
+        if self._index_db is None:
+            rebuild = not self.index_path.exists()
+            db = sqlite3.connect(str(self.index_path), check_same_thread=False)
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    conversations.append({
-                        'id': data.get('id', file_path.stem),
-                        'title': data.get('title', 'Untitled'),
-                        'created_at': data.get('created_at'),
-                        'updated_at': data.get('updated_at'),
-                        'message_count': len(data.get('messages', [])),
-                        'path': str(file_path)
-                    })
-            except Exception as e:
-                logger.error(f"Error reading conversation file {file_path}: {e}")
-        
-        # Sort by last updated (newest first)
-        return sorted(
-            conversations,
-            key=lambda x: x.get('updated_at', ''),
-            reverse=True
-        )
+                db.row_factory = sqlite3.Row
+                db.execute("PRAGMA synchronous=NORMAL")
+                db.execute(_INDEX_SCHEMA)
+                if rebuild:
+                    with db:
+                        db.executemany(_INDEX_UPSERT, self._scan_conversations().values())
+                    (self.save_dir / _LEGACY_INDEX).unlink(missing_ok=True)
+                else:
+                    with db:
+                        self._sync_with_files(db)
+            except Exception:
+                db.close()
+                raise
+            self._index_db = db
+        return self._index_db
+    
+    def close(self) -> None:
+        """Close the index database and the file-reading workers."""
+        with self._index_lock:
+            if self._index_db is not None:
+                self._index_db.close()
+                self._index_db = None
+                self._cached_list = None
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def _scan_conversations(self) -> Dict[str, Dict[str, Any]]:
+        """Read the metadata of every conversation file in the save directory.
+        
+        Files are read concurrently so their I/O overlaps.
+        """
+        file_paths = [p for p in self.save_dir.glob('*.json') if p.name != _LEGACY_INDEX]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="conversation-scan")
+        
+        index = {}
+        for record in self._executor.map(self._try_read_metadata, file_paths):
+            if record is not None:
+                index[record['id']] = record
+        return index
+    
+    def _try_read_metadata(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Read a conversation file's index record, logging and skipping failures."""
+        try:
+            return self._read_metadata(file_path)
+        except Exception as e:
+            logger.error(f"Error reading conversation file {file_path}: {e}")
+            return None
+    
+    def _read_metadata(self, file_path: Path) -> Dict[str, Any]:
+        """Read a conversation file's index record.
+        
+        With ijson available the file is streamed, so the messages are
+        counted without being materialized.
+        """
+        if not HAS_IJSON:
+            with open(file_path, 'rb') as f:
+                return self._metadata(_loads(f.read()), file_path)
+        
+        data: Dict[str, Any] = {}
+        message_count = 0
+        with open(file_path, 'rb') as f:
+            for prefix, event, value in ijson.parse(f):
+                if prefix == 'messages.item':
+                    if event in _SCALAR_EVENTS:
+                        message_count += 1
+                elif prefix in _METADATA_FIELDS and event in _SCALAR_EVENTS:
+                    data[prefix] = value
+        return self._metadata(data, file_path, message_count)
     
     def delete_conversation(self, conversation_id: str) -> bool:
         """Delete a conversation.
@@ -127,6 +353,10 @@ class ConversationManager:
         try:
             if file_path.exists():
                 file_path.unlink()
+                self._cached_list = None
+                self._run_index(lambda db: db.execute(
+                    "DELETE FROM conversations WHERE id = ?", (conversation_id,)
+                ))
                 logger.info(f"Deleted conversation {conversation_id}")
                 return True
             return False
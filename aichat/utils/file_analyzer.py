@@ -3,36 +3,402 @@ File analysis utilities for processing different file types.
 """
 import os
 import io
+import copy
 import csv
+import importlib.util
 import json
+import logging
+import re
+import struct
+import sys
+import threading
 import PyPDF2
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import OrderedDict
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, Optional, Union, BinaryIO, List
+from typing import Dict, Any, Optional, Union, BinaryIO, List, Tuple
 from docx import Document
+from openpyxl import load_workbook
 from PIL import Image, UnidentifiedImageError
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import pypdfium2 as pdfium
+    HAS_PDFIUM = True
+except ImportError:
+    HAS_PDFIUM = False
+
+# numba takes seconds to import, so it is only looked up here and imported
+# the first time a large text file is counted
+HAS_NUMBA = importlib.util.find_spec('numba') is not None
+
+logger = logging.getLogger(__name__)
+
+# PDFs with fewer pages are extracted in-process; starting workers costs more
+_PARALLEL_PDF_MIN_PAGES = 4
+# Pages per extraction worker when the worker count is chosen automatically
+_PAGES_PER_WORKER = 10
+# Rows of a CSV or Excel file returned as content; the rest are only counted
+_PREVIEW_ROWS = 500
+# Rows parsed at a time when streaming a CSV file
+_CSV_CHUNK_ROWS = 100_000
+# Text files at least this large are counted with the Numba kernel
+_NUMBA_MIN_BYTES = 1024 * 1024
+# Total file size whose analysis results may be kept in the cache
+_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# PDFium is not thread-safe, so only one thread may use it at a time
+_PDFIUM_LOCK = threading.Lock()
+# A word is a run of non-whitespace, as with str.split()
+_WORD_RE = re.compile(r'\S+')
+# The same over raw bytes, where only ASCII whitespace separates words
+_WORD_BYTES_RE = re.compile(rb'\S+')
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse UTF-8 JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _count_line_ends_words(data):
+    """Count line ends and ASCII-whitespace separated words in a byte array.
+    
+    CRLF, CR and LF each end one line. Compiled with Numba by
+    _get_numba_counter; too slow to run as Python.
+    """
+    line_ends = 0
+    words = 0
+    in_word = False
+    prev = 0
+    for c in data:
+        if c == 13 or (c == 10 and prev != 13):
+            line_ends += 1
+        if c == 32 or 9 <= c <= 13:
+            in_word = False
+        elif not in_word:
+            words += 1
+            in_word = True
+        prev = c
+    return line_ends, words
+
+
+# Compiled counter; None until first needed, False if numba is unusable
+_numba_counter = None
+_numba_lock = threading.Lock()
+
+
+def _get_numba_counter():
+    """Import numba and compile the counting kernel on first use.
+    
+    Returns:
+        Function counting (line ends, words) in bytes, or None if numba cannot
+        be imported or compiled, for example in a read-only frozen build
+    """
+    global _numba_counter
+    with _numba_lock:
+        if _numba_counter is None:
+            try:
+                import numpy as np
+                from numba import njit
+                kernel = njit(nogil=True)(_count_line_ends_words)
+                # Compile now so a failure falls back here, not mid-count
+                kernel(np.zeros(1, dtype=np.uint8))
+                _numba_counter = lambda raw: kernel(np.frombuffer(raw, dtype=np.uint8))
+            except Exception as e:
+                logger.warning(f"Numba text counting unavailable: {e}")
+                _numba_counter = False
+        return _numba_counter or None
+
+
+def _count_bytes(raw: bytes) -> Tuple[int, int]:
+    """Count the line ends and words in UTF-8 bytes.
+    
+    Line ends are CRLF, CR and LF, as with universal newlines. Large
+    inputs use a compiled Numba kernel when numba is usable, otherwise
+    bytes.count and a regex iterator.
+    
+    Returns:
+        Tuple of (line end count, word count)
+    """
+    if HAS_NUMBA and len(raw) >= _NUMBA_MIN_BYTES:
+        counter = _get_numba_counter()
+        if counter is not None:
+            return counter(raw)
+    line_ends = raw.count(b'\n') + raw.count(b'\r') - raw.count(b'\r\n')
+    return line_ends, sum(1 for _ in _WORD_BYTES_RE.finditer(raw))
+
+
+def _text_stats(content: str) -> Tuple[int, int, int]:
+    """Count the lines, words and characters of some text.
+    
+    Words are counted off a regex iterator, so no list of substrings is
+    built, and any Unicode whitespace separates them.
+    
+    Returns:
+        Tuple of (line count, word count, character count)
+    """
+    newlines = content.count('\n')
+    word_count = sum(1 for _ in _WORD_RE.finditer(content))
+    line_count = newlines + (1 if content and not content.endswith('\n') else 0)
+    return line_count, word_count, len(content)
+
+
+class _ResultCache:
+    """Least-recently-used cache of analysis results, bounded by file size.
+    
+    Results that carry content are charged their file's size, so the cache
+    never holds much more decoded content than _CACHE_MAX_BYTES. Results are
+    deep-copied on the way out so callers cannot change the cached ones.
+    """
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Tuple[str, int, int], Tuple[Dict[str, Any], int]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple[str, int, int]) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result for key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry[0])
+    
+    def put(self, key: Tuple[str, int, int], result: Dict[str, Any]) -> None:
+        """Cache a result, evicting the least recently used ones to make room."""
+        cost = result['size'] if result.get('content') is not None else 0
+        if cost > self.max_bytes:
+            return
+        result = copy.deepcopy(result)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (result, cost)
+            self._bytes += cost
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_cost) = self._entries.popitem(last=False)
+                self._bytes -= evicted_cost
+    
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_result_cache = _ResultCache(_CACHE_MAX_BYTES)
+
+
+# Pillow's mode for each PNG (bit depth, color type) that maps to one mode
+_PNG_MODES = {
+    (1, 0): '1', (8, 0): 'L',
+    (8, 2): 'RGB', (16, 2): 'RGB',
+    (1, 3): 'P', (2, 3): 'P', (4, 3): 'P', (8, 3): 'P',
+    (8, 4): 'LA',
+    (8, 6): 'RGBA', (16, 6): 'RGBA',
+}
+# Pillow's mode for each JPEG component count
+_JPEG_MODES = {1: 'L', 3: 'RGB', 4: 'CMYK'}
+# JPEG start-of-frame markers, which carry the image size
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _sniff_image(file_path: Path) -> Optional[Tuple[str, str, int, int]]:
+    """Read the format, mode and size of a PNG or JPEG from its header.
+    
+    Returns:
+        Tuple of (format, mode, width, height), or None if the file is not a
+        PNG or JPEG this can read, in which case Pillow should be used
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(26)
+        if len(head) == 26 and head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+            width, height, bit_depth, color_type = struct.unpack('>IIBB', head[16:26])
+            mode = _PNG_MODES.get((bit_depth, color_type))
+            return ('PNG', mode, width, height) if mode else None
+        if head[:3] != b'\xff\xd8\xff':
+            return None
+        
+        # Walk the JPEG segments up to the start-of-frame marker
+        f.seek(2)
+        while True:
+            marker = f.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                return None
+            code = marker[1]
+            if code in _JPEG_SOF_MARKERS:
+                segment = f.read(8)
+                if len(segment) < 8:
+                    return None
+                height, width = struct.unpack('>HH', segment[3:7])
+                mode = _JPEG_MODES.get(segment[7])
+                return ('JPEG', mode, width, height) if mode else None
+            if code == 0xFF:
+                # Fill byte; the second 0xFF starts the next marker
+                f.seek(-1, os.SEEK_CUR)
+                continue
+            if 0xD0 <= code <= 0xD8 or code == 0x01:
+                # Markers without a length field
+                continue
+            if code in (0xD9, 0xDA):
+                # End of image or start of scan before any frame header
+                return None
+            length = f.read(2)
+            if len(length) < 2:
+                return None
+            f.seek(struct.unpack('>H', length)[0] - 2, os.SEEK_CUR)
+
+
+def _unique_headers(cells: Tuple[Any, ...]) -> List[Any]:
+    """Name a table's columns from its header cells the way pandas does.
+    
+    Blank cells become 'Unnamed: <index>' and repeated names get '.1', '.2'
+    and so on, so every column keeps its own key.
+    """
+    headers = []
+    seen = set()
+    counts: Dict[Any, int] = {}
+    for i, cell in enumerate(cells):
+        name = f'Unnamed: {i}' if cell is None or cell == '' else cell
+        if name in seen:
+            count = counts.get(name, 0)
+            while True:
+                count += 1
+                candidate = f'{name}.{count}'
+                if candidate not in seen:
+                    break
+            counts[name] = count
+            name = candidate
+        seen.add(name)
+        headers.append(name)
+    return headers
+
+
+def _get_max_workers(num_pages: int) -> int:
+    """Pick a worker count for extracting a PDF with the given number of pages."""
+    return max(1, min(os.cpu_count() or 1, -(-num_pages // _PAGES_PER_WORKER)))
+
+
+def _extract_pdf_pages(file_path: str, start: int, stop: int) -> List[Tuple[int, str]]:
+    """Extract the text of a range of PDF pages.
+    
+    Runs in a worker process, so the PDF is reopened by path; readers cannot
+    be pickled.
+    
+    Args:
+        file_path: Path to the PDF file
+        start: Index of the first page to extract
+        stop: Index one past the last page to extract
+        
+    Returns:
+        List of (page index, text) pairs
+    """
+    pdf_reader = PyPDF2.PdfReader(file_path)
+    return [(i, pdf_reader.pages[i].extract_text()) for i in range(start, stop)]
+
+
+def _extract_pypdf2_text(file_path: Path, num_workers: Optional[int] = None) -> List[str]:
+    """Extract the text of every page of a PDF with PyPDF2.
+    
+    Args:
+        file_path: Path to the PDF file
+        num_workers: Processes to spread the pages over (default: chosen
+            from the page count)
+        
+    Returns:
+        List with the text of each page
+    """
+    with open(file_path, 'rb') as f:
+        pdf_reader = PyPDF2.PdfReader(f)
+        num_pages = len(pdf_reader.pages)
+        if getattr(sys, 'frozen', False):
+            # Worker processes re-run a frozen executable instead of the
+            # worker function, so a packaged build stays in-process
+            num_workers = 1
+        elif num_workers is None:
+            num_workers = _get_max_workers(num_pages)
+        num_workers = min(num_workers, num_pages)
+        if num_pages < _PARALLEL_PDF_MIN_PAGES or num_workers <= 1:
+            return [page.extract_text() for page in pdf_reader.pages]
+    
+    step = -(-num_pages // num_workers)
+    with ProcessPoolExecutor(max_workers=num_workers) as pool:
+        futures = [
+            pool.submit(_extract_pdf_pages, str(file_path), start, min(start + step, num_pages))
+            for start in range(0, num_pages, step)
+        ]
+        # Ranges were submitted in page order, so concatenating keeps it
+        return [page_text for future in futures for _, page_text in future.result()]
+
+
+def _extract_pdfium_text(file_path: Path) -> List[str]:
+    """Extract the text of every page of a PDF with PDFium.
+    
+    Pages are read one after another, and the whole document is handled
+    under _PDFIUM_LOCK: PDFium is not thread-safe, and its native extraction
+    is fast enough that worker processes would cost more than they save.
+    
+    Args:
+        file_path: Path to the PDF file
+        
+    Returns:
+        List with the text of each page
+    """
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(str(file_path))
+        try:
+            text = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                text.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+            return text
+        finally:
+            pdf.close()
+
 class FileAnalyzer:
     """Utility class for analyzing different file types."""
     
     @staticmethod
-    def analyze_file(file_path: Union[str, Path], max_size: int = 10*1024*1024) -> Dict[str, Any]:
+    def analyze_file(file_path: Union[str, Path], max_size: int = 10*1024*1024,
+                     num_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Analyze a file and return its content and metadata.
         
         Args:
             file_path: Path to the file to analyze
             max_size: Maximum file size to process in bytes (default: 10MB)
+            num_workers: Processes used to extract PDF pages (default: chosen
+                from the page count)
             
+        Results are cached per path, modification time and size, so asking
+        again about an unchanged file does not re-parse it. Each call gets
+        its own copy of the result.
+        
         Returns:
             Dict containing file metadata and content/analysis
             """
         file_path = Path(file_path)
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        # Get basic file info; the one stat also tells whether the file exists
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
+        file_size = stat.st_size
             
-        # Get basic file info
-        file_size = file_path.stat().st_size
         if file_size > max_size:
             return {
                 'path': str(file_path),
@@ -43,25 +409,64 @@ class FileAnalyzer:
                 'content': None
             }
         
+        key = (str(file_path), stat.st_mtime_ns, file_size)
+        result = _result_cache.get(key)
+        if result is None:
+            result = FileAnalyzer._analyze(file_path, file_size, num_workers)
+            _result_cache.put(key, result)
+        return result
+    
+    @staticmethod
+    def analyze_files(file_paths: List[Union[str, Path]], max_workers: Optional[int] = None,
+                      max_size: int = 10*1024*1024, mode: str = 'io') -> List[Dict[str, Any]]:
+        """
+        Analyze several files concurrently.
+        
+        Args:
+            file_paths: Paths to the files to analyze
+            max_workers: Maximum number of concurrent workers (default: chosen
+                from the CPU count)
+            max_size: Maximum file size to process in bytes (default: 10MB)
+            mode: 'io' to use threads, which suits text, JSON and image
+                files where reading dominates; 'cpu' to use processes for PDF
+                and Excel files, whose parsing is CPU-bound Python that holds
+                the GIL
+            
+        Returns:
+            List of analysis results, in the same order as file_paths
+        """
+        # Each worker extracts its PDFs' pages itself rather than starting a
+        # process pool of its own
+        analyze = partial(FileAnalyzer.analyze_file, max_size=max_size, num_workers=1)
+        if mode == 'cpu':
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+        elif mode == 'io':
+            executor = ThreadPoolExecutor(max_workers=max_workers or min(32, (os.cpu_count() or 1) * 4))
+        else:
+            raise ValueError(f"Unknown analysis mode: {mode}")
+        
+        with executor:
+            return list(executor.map(analyze, file_paths))
+    
+    @staticmethod
+    def clear_cache() -> None:
+        """Forget all cached analysis results."""
+        _result_cache.clear()
+    
+    @staticmethod
+    def _analyze(file_path: Path, file_size: int,
+                 num_workers: Optional[int]) -> Dict[str, Any]:
+        """Analyze a file with the handler for its extension."""
         # Get file extension
         ext = file_path.suffix.lower()
         
         # Analyze based on file type
         try:
-            if ext in ['.txt', '.md', '.log', '.py', '.js', '.html', '.css']:
-                return FileAnalyzer._analyze_text_file(file_path)
-            elif ext == '.pdf':
-                return FileAnalyzer._analyze_pdf(file_path)
-            elif ext in ['.docx', '.doc']:
-                return FileAnalyzer._analyze_docx(file_path)
-            elif ext in ['.csv']:
-                return FileAnalyzer._analyze_csv(file_path)
-            elif ext in ['.xlsx', '.xls']:
-                return FileAnalyzer._analyze_excel(file_path)
-            elif ext in ['.json']:
-                return FileAnalyzer._analyze_json(file_path)
-            elif ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp']:
-                return FileAnalyzer._analyze_image(file_path)
+            handler = _EXT_HANDLERS.get(ext)
+            if handler is FileAnalyzer._analyze_pdf:
+                return handler(file_path, file_size, num_workers)
+            elif handler is not None:
+                return handler(file_path, file_size)
             else:
                 return {
                     'path': str(file_path),
@@ -82,64 +487,83 @@ class FileAnalyzer:
             }
     
     @staticmethod
-    def _analyze_text_file(file_path: Path) -> Dict[str, Any]:
-        """Analyze a text file."""
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+    def _analyze_text_file(file_path: Path, file_size: int) -> Dict[str, Any]:
+        """Analyze a text file.
+        
+        Lines and words are counted on the raw bytes, which is cheaper than
+        scanning the decoded text; the bytes are decoded once for the content.
+        Lines end at CRLF, CR or LF and the content uses LF, as when
+        reading in text mode.
+        """
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        line_ends, word_count = _count_bytes(raw)
+        line_count = line_ends + (1 if raw and not raw.endswith((b'\n', b'\r')) else 0)
+        content = raw.decode('utf-8', errors='ignore')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        char_count = len(content)
         
         return {
             'path': str(file_path),
             'name': file_path.name,
-            'size': file_path.stat().st_size,
+            'size': file_size,
             'type': 'text',
             'content': content,
-            'line_count': len(content.splitlines()),
-            'word_count': len(content.split()),
-            'char_count': len(content)
+            'line_count': line_count,
+            'word_count': word_count,
+            'char_count': char_count
         }
     
     @staticmethod
-    def _analyze_pdf(file_path: Path) -> Dict[str, Any]:
-        """Extract text from a PDF file."""
-        text = []
-        with open(file_path, 'rb') as f:
-            pdf_reader = PyPDF2.PdfReader(f)
-            num_pages = len(pdf_reader.pages)
-            for page in pdf_reader.pages:
-                text.append(page.extract_text())
+    def _analyze_pdf(file_path: Path, file_size: int,
+                     num_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Extract text from a PDF file.
+        
+        Uses PDFium when pypdfium2 is installed. Otherwise larger PDFs are
+        split into page ranges that PyPDF2 extracts in parallel worker
+        processes.
+        """
+        if HAS_PDFIUM:
+            text = _extract_pdfium_text(file_path)
+        else:
+            text = _extract_pypdf2_text(file_path, num_workers)
+        num_pages = len(text)
         
         content = '\n\n'.join(text)
+        _, word_count, char_count = _text_stats(content)
         return {
             'path': str(file_path),
             'name': file_path.name,
-            'size': file_path.stat().st_size,
+            'size': file_size,
             'type': 'pdf',
             'content': content,
             'page_count': num_pages,
-            'word_count': len(content.split()),
-            'char_count': len(content)
+            'word_count': word_count,
+            'char_count': char_count
         }
     
     @staticmethod
-    def _analyze_docx(file_path: Path) -> Dict[str, Any]:
+    def _analyze_docx(file_path: Path, file_size: int) -> Dict[str, Any]:
         """Extract text from a Word document."""
         doc = Document(file_path)
         text = [paragraph.text for paragraph in doc.paragraphs]
         content = '\n'.join(text)
+        _, word_count, char_count = _text_stats(content)
         
         return {
             'path': str(file_path),
             'name': file_path.name,
-            'size': file_path.stat().st_size,
+            'size': file_size,
             'type': 'document',
             'content': content,
             'paragraph_count': len(text),
-            'word_count': len(content.split()),
-            'char_count': len(content)
+            'word_count': word_count,
+            'char_count': char_count
         }
     
     @staticmethod
-    def _analyze_csv(file_path: Path) -> Dict[str, Any]:
+    def _analyze_csv(file_path: Path, file_size: int) -> Dict[str, Any]:
         """Analyze a CSV file."""
         with open(file_path, 'r', encoding='utf-8') as f:
             # Read first few rows to determine structure
@@ -152,85 +576,110 @@ class FileAnalyzer:
                 has_header = csv.Sniffer().has_header(sample)
                 f.seek(0)
                 
-                # Read the full file with detected dialect
-                reader = csv.reader(f, dialect)
-                rows = list(reader)
-                
-                # Get headers if present
-                headers = rows[0] if has_header and len(rows) > 0 else []
-                data = rows[1:] if has_header and len(rows) > 1 else rows
+                # Stream the file through pandas' C parser, keeping only a
+                # preview of the rows in memory
+                headers = []
+                data = []
+                row_count = 0
+                column_count = 0
+                try:
+                    chunks = pd.read_csv(
+                        f, dialect=dialect, header=0 if has_header else None,
+                        dtype=str, keep_default_na=False, engine='c',
+                        chunksize=_CSV_CHUNK_ROWS
+                    )
+                    for chunk in chunks:
+                        if row_count == 0:
+                            headers = chunk.columns.tolist() if has_header else []
+                            data = chunk.head(_PREVIEW_ROWS).values.tolist()
+                            column_count = len(chunk.columns)
+                        row_count += len(chunk)
+                except pd.errors.EmptyDataError:
+                    # Nothing but blank lines: an empty table
+                    pass
                 
                 return {
                     'path': str(file_path),
                     'name': file_path.name,
-                    'size': file_path.stat().st_size,
+                    'size': file_size,
                     'type': 'csv',
                     'content': {'headers': headers, 'data': data},
-                    'row_count': len(data),
-                    'column_count': len(headers) if headers else (len(data[0]) if data else 0)
+                    'row_count': row_count,
+                    'column_count': column_count
                 }
                 
-            except (csv.Error, UnicodeDecodeError):
+            except (csv.Error, UnicodeDecodeError, pd.errors.ParserError):
                 # Fallback to reading as text
                 f.seek(0)
                 content = f.read()
                 return {
                     'path': str(file_path),
                     'name': file_path.name,
-                    'size': file_path.stat().st_size,
+                    'size': file_size,
                     'type': 'text',
                     'content': content,
                     'line_count': len(content.splitlines())
                 }
     
     @staticmethod
-    def _analyze_excel(file_path: Path) -> Dict[str, Any]:
-        """Analyze an Excel file."""
+    def _analyze_excel(file_path: Path, file_size: int) -> Dict[str, Any]:
+        """Analyze an Excel file.
+        
+        .xlsx sheets are streamed row by row; only a preview of the rows is
+        kept in memory.
+        """
         try:
-            # Try reading with openpyxl first (better for .xlsx)
-            try:
-                df = pd.read_excel(file_path, engine='openpyxl')
-            except ImportError:
-                # Fall back to xlrd for .xls files
+            if file_path.suffix.lower() == '.xls':
+                # openpyxl cannot read the legacy format, so use xlrd
                 df = pd.read_excel(file_path, engine='xlrd')
-            
-            # Convert to list of dicts for JSON serialization
-            data = df.to_dict(orient='records')
+                headers = df.columns.tolist()
+                data = df.head(_PREVIEW_ROWS).to_dict(orient='records')
+                row_count = len(df)
+            else:
+                wb = load_workbook(file_path, read_only=True, data_only=True)
+                try:
+                    rows = wb.active.iter_rows(values_only=True)
+                    headers = _unique_headers(next(rows, ()))
+                    # Rows as dicts for JSON serialization
+                    data = [dict(zip(headers, row)) for row in islice(rows, _PREVIEW_ROWS)]
+                    row_count = len(data) + sum(1 for _ in rows)
+                finally:
+                    wb.close()
             
             return {
                 'path': str(file_path),
                 'name': file_path.name,
-                'size': file_path.stat().st_size,
+                'size': file_size,
                 'type': 'excel',
                 'content': {
-                    'headers': df.columns.tolist(),
-                    'data': data,
-                    'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()}
+                    'headers': headers,
+                    'data': data
                 },
-                'row_count': len(df),
-                'column_count': len(df.columns)
+                'row_count': row_count,
+                'column_count': len(headers)
             }
             
         except Exception as e:
             return {
                 'path': str(file_path),
                 'name': file_path.name,
-                'size': file_path.stat().st_size,
+                'size': file_size,
                 'type': 'file',
                 'error': f'Error reading Excel file: {str(e)}',
                 'content': None
             }
     
     @staticmethod
-    def _analyze_json(file_path: Path) -> Dict[str, Any]:
+    def _analyze_json(file_path: Path, file_size: int) -> Dict[str, Any]:
         """Analyze a JSON file."""
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with open(file_path, 'rb') as f:
             try:
-                data = json.load(f)
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError
+                data = _loads(f.read())
                 return {
                     'path': str(file_path),
                     'name': file_path.name,
-                    'size': file_path.stat().st_size,
+                    'size': file_size,
                     'type': 'json',
                     'content': data
                 }
@@ -238,21 +687,40 @@ class FileAnalyzer:
                 return {
                     'path': str(file_path),
                     'name': file_path.name,
-                    'size': file_path.stat().st_size,
+                    'size': file_size,
                     'type': 'text',
                     'error': f'Invalid JSON: {str(e)}',
                     'content': None
                 }
     
     @staticmethod
-    def _analyze_image(file_path: Path) -> Dict[str, Any]:
-        """Analyze an image file."""
+    def _analyze_image(file_path: Path, file_size: int) -> Dict[str, Any]:
+        """Analyze an image file.
+        
+        PNG and JPEG headers are read directly; Pillow is only used for other
+        formats and headers the sniffer does not understand.
+        """
+        sniffed = _sniff_image(file_path)
+        if sniffed is not None:
+            image_format, mode, width, height = sniffed
+            return {
+                'path': str(file_path),
+                'name': file_path.name,
+                'size': file_size,
+                'type': 'image',
+                'content': None,  # Don't include binary data in the response
+                'format': image_format,
+                'mode': mode,
+                'width': width,
+                'height': height
+            }
+        
         try:
             with Image.open(file_path) as img:
                 return {
                     'path': str(file_path),
                     'name': file_path.name,
-                    'size': file_path.stat().st_size,
+                    'size': file_size,
                     'type': 'image',
                     'content': None,  # Don't include binary data in the response
                     'format': img.format,
@@ -264,7 +732,7 @@ class FileAnalyzer:
             return {
                 'path': str(file_path),
                 'name': file_path.name,
-                'size': file_path.stat().st_size,
+                'size': file_size,
                 'type': 'file',
                 'error': 'Unsupported or corrupted image',
                 'content': None
@@ -280,38 +748,46 @@ class FileAnalyzer:
         name = analysis.get('name', 'Unknown')
         size_mb = analysis.get('size', 0) / (1024 * 1024)
         
-        if file_type == 'TEXT':
-            lines = analysis.get('line_count', 0)
-            words = analysis.get('word_count', 0)
-            return f"{file_type}: {name} ({size_mb:.2f} MB, {lines} lines, {words} words)"
-        
-        elif file_type == 'PDF':
-            pages = analysis.get('page_count', 0)
-            words = analysis.get('word_count', 0)
-            return f"{file_type}: {name} ({size_mb:.2f} MB, {pages} pages, {words} words)"
-        
-        elif file_type == 'DOCUMENT':
-            paras = analysis.get('paragraph_count', 0)
-            words = analysis.get('word_count', 0)
-            return f"{file_type}: {name} ({size_mb:.2f} MB, {paras} paragraphs, {words} words)"
-        
-        elif file_type in ['CSV', 'EXCEL']:
-            rows = analysis.get('row_count', 0)
-            cols = analysis.get('column_count', 0)
-            return f"{file_type}: {name} ({size_mb:.2f} MB, {rows} rows, {cols} columns)"
-        
-        elif file_type == 'JSON':
-            # Try to determine if it's an array or object
-            content = analysis.get('content', {})
-            if isinstance(content, list):
-                return f"{file_type}: {name} ({size_mb:.2f} MB, {len(content)} items)"
-            elif isinstance(content, dict):
-                return f"{file_type}: {name} ({size_mb:.2f} MB, {len(content)} keys)"
+        formatter = _SUMMARY_FORMATTERS.get(file_type)
+        if formatter is None:
             return f"{file_type}: {name} ({size_mb:.2f} MB)"
-        
-        elif file_type == 'IMAGE':
-            width = analysis.get('width', 0)
-            height = analysis.get('height', 0)
-            return f"{file_type}: {name} ({size_mb:.2f} MB, {width}x{height} pixels)"
-        
-        return f"{file_type}: {name} ({size_mb:.2f} MB)"
+        return f"{file_type}: {name} ({size_mb:.2f} MB{formatter(analysis)})"
+
+
+def _table_details(analysis: Dict[str, Any]) -> str:
+    """Describe the size of a CSV or Excel table."""
+    return f", {analysis.get('row_count', 0)} rows, {analysis.get('column_count', 0)} columns"
+
+
+def _json_details(analysis: Dict[str, Any]) -> str:
+    """Describe whether a JSON document is an array or an object."""
+    content = analysis.get('content', {})
+    if isinstance(content, list):
+        return f", {len(content)} items"
+    elif isinstance(content, dict):
+        return f", {len(content)} keys"
+    return ""
+
+
+# Type-specific details appended to a file summary, keyed by upper-cased type
+_SUMMARY_FORMATTERS = {
+    'TEXT': lambda a: f", {a.get('line_count', 0)} lines, {a.get('word_count', 0)} words",
+    'PDF': lambda a: f", {a.get('page_count', 0)} pages, {a.get('word_count', 0)} words",
+    'DOCUMENT': lambda a: f", {a.get('paragraph_count', 0)} paragraphs, {a.get('word_count', 0)} words",
+    'CSV': _table_details,
+    'EXCEL': _table_details,
+    'JSON': _json_details,
+    'IMAGE': lambda a: f", {a.get('width', 0)}x{a.get('height', 0)} pixels",
+}
+
+
+# Analyzer for each supported file extension
+_EXT_HANDLERS = {
+    **dict.fromkeys(['.txt', '.md', '.log', '.py', '.js', '.html', '.css'], FileAnalyzer._analyze_text_file),
+    '.pdf': FileAnalyzer._analyze_pdf,
+    **dict.fromkeys(['.docx', '.doc'], FileAnalyzer._analyze_docx),
+    '.csv': FileAnalyzer._analyze_csv,
+    **dict.fromkeys(['.xlsx', '.xls'], FileAnalyzer._analyze_excel),
+    '.json': FileAnalyzer._analyze_json,
+    **dict.fromkeys(['.jpg', '.jpeg', '.png', '.gif', '.bmp'], FileAnalyzer._analyze_image),
+}
@@ -1,46 +1,140 @@
 import os
 import json
+import logging
+import threading
 from typing import List, Dict, Optional
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+logger = logging.getLogger(__name__)
+
 PROMPT_LIBRARY_PATH = os.path.expanduser(os.path.join("~", ".aichat_prompts.json"))
 
+# Edits within this many seconds of each other are written to disk together
+SAVE_DELAY = 0.2
+
 class PromptLibrary:
     def __init__(self, path: Optional[str] = None):
         self.path = path or PROMPT_LIBRARY_PATH
+        self._lock = threading.RLock()
+        self._save_timer: Optional[threading.Timer] = None
+        self._dirty = False
         self.prompts = self._load_prompts()
+        # Prompts are looked up by name; the first of any duplicates wins, but
+        # all of them are kept so saving never drops one
+        self._by_name: Dict[str, Dict[str, str]] = {}
+        for p in self.prompts:
+            if p["name"] in self._by_name:
+                logger.warning(f"Duplicate prompt name in library: {p['name']}")
+            else:
+                self._by_name[p["name"]] = p
 
     def _load_prompts(self) -> List[Dict[str, str]]:
         if os.path.exists(self.path):
             try:
-                with open(self.path, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                with open(self.path, "rb") as f:
+                    raw = f.read()
+                return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
             except Exception:
                 return []
         return []
 
     def _save_prompts(self):
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(self.prompts, f, indent=2, ensure_ascii=False)
+        if HAS_ORJSON:
+            payload = orjson.dumps(self.prompts, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(self.prompts, indent=2, ensure_ascii=False).encode("utf-8")
+        # Write a sibling file and swap it in, so a crash mid-write never
+        # leaves a truncated library behind
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _schedule_save(self):
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(SAVE_DELAY, self._flush_in_background)
+                self._save_timer.start()
+
+    def _flush_in_background(self):
+        # Nobody can catch an error raised on the timer thread; the edits stay
+        # pending so the next edit or flush() tries again
+        try:
+            self.flush()
+        except OSError as e:
+            logger.error(f"Error saving prompt library: {e}")
+
+    def flush(self):
+        """Write pending edits to disk now.
+        
+        Raises:
+            OSError: If the library could not be written; the edits stay pending
+        """
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if self._dirty:
+                self._save_prompts()
+                self._dirty = False
 
     def get_prompts(self) -> List[Dict[str, str]]:
         return self.prompts
 
+    def get_prompt(self, name: str) -> Optional[Dict[str, str]]:
+        return self._by_name.get(name)
+
     def add_prompt(self, name: str, text: str):
-        self.prompts.append({"name": name, "text": text})
-        self._save_prompts()
+        with self._lock:
+            entry = self._by_name.get(name)
+            if entry is not None:
+                entry["text"] = text
+            else:
+                entry = {"name": name, "text": text}
+                self._by_name[name] = entry
+                self.prompts.append(entry)
+        self._schedule_save()
 
     def delete_prompt(self, name: str):
-        self.prompts = [p for p in self.prompts if p["name"] != name]
-        self._save_prompts()
+        with self._lock:
+            if self._by_name.pop(name, None) is None:
+                return
+            # Duplicates loaded from disk go too
+            self.prompts = [p for p in self.prompts if p["name"] != name]
+        self._schedule_save()
 
-    def rename_prompt(self, old_name: str, new_name: str):
-        for p in self.prompts:
-            if p["name"] == old_name:
-                p["name"] = new_name
-        self._save_prompts()
+    def rename_prompt(self, old_name: str, new_name: str) -> bool:
+        """Rename a prompt.
+        
+        Returns:
+            False if there is no prompt called old_name or new_name is taken
+        """
+        with self._lock:
+            entry = self._by_name.get(old_name)
+            if entry is None or new_name in self._by_name:
+                return False
+            del self._by_name[old_name]
+            entry["name"] = new_name
+            self._by_name[new_name] = entry
+            # A duplicate loaded from disk takes over the old name
+            duplicate = next((p for p in self.prompts if p["name"] == old_name), None)
+            if duplicate is not None:
+                self._by_name[old_name] = duplicate
+        self._schedule_save()
+        return True
 
     def update_prompt(self, name: str, new_text: str):
-        for p in self.prompts:
-            if p["name"] == name:
-                p["text"] = new_text
-        self._save_prompts() 
\ No newline at end of file
+        with self._lock:
+            entry = self._by_name.get(name)
+            if entry is None:
+                return
+            entry["text"] = new_text
+        self._schedule_save()
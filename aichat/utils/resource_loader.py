@@ -5,36 +5,56 @@ Resource Loader - Utility for loading application resources like icons and image
 import os
 import sys
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Union, Dict, Any
-from PyQt5.QtGui import QIcon, QPixmap, QColor, QFont, QFontDatabase
+import numpy as np
+from PyQt5.QtGui import QIcon, QPixmap, QColor, QFont, QFontDatabase, QImage, QImageReader, QPainter
 from PyQt5.QtSvg import QSvgRenderer
 from PyQt5.QtCore import Qt, QByteArray, QBuffer, QIODevice, QSize
 
 logger = logging.getLogger(__name__)
 
-class ResourceLoader:
-    """Handles loading and caching of application resources."""
+
+def _recolor(pixmap: QPixmap, color: str) -> QPixmap:
+    """Paint every non-transparent pixel of a pixmap in a single color.
     
-    _instance = None
-    _initialized = False
+    The pixels are rewritten through a NumPy view of the image buffer rather
+    than one pixelColor/setPixelColor call per pixel. Alpha is kept, so
+    antialiased edges stay smooth.
+    
+    Args:
+        pixmap: Pixmap to recolor.
+        color: Color to apply (e.g., '#FF0000').
+        
+    Returns:
+        QPixmap: The recolored pixmap.
+    """
+    image = pixmap.toImage().convertToFormat(QImage.Format_ARGB32)
+    ptr = image.bits()
+    ptr.setsize(image.byteCount())
+    # Each pixel is one 0xAARRGGBB word, whatever the byte order
+    pixels = np.frombuffer(ptr, np.uint32)
+    mask = pixels > 0x00FFFFFF
+    pixels[mask] = (pixels[mask] & 0xFF000000) | (QColor(color).rgb() & 0x00FFFFFF)
+    return QPixmap.fromImage(image)
+
+
+class ResourceLoader:
+    """Handles loading and caching of application resources.
     
-    def __new__(cls):
-        """Create a singleton instance."""
-        if cls._instance is None:
-            cls._instance = super(ResourceLoader, cls).__new__(cls)
-        return cls._instance
+    The application shares the module-level ``resource_loader`` instance.
+    """
     
     def __init__(self):
         """Initialize the resource loader."""
-        if self._initialized:
-            return
-            
         self._resource_dirs = []
         self._icon_cache = {}
         self._pixmap_cache = {}
         self._font_cache = {}
         self._svg_renderer_cache = {}
+        # Resolved location of each looked-up resource, None if not found
+        self._resource_path_cache: Dict[str, Optional[Path]] = {}
         
         # Add default resource directories
         self.add_resource_dir('resources')
@@ -42,8 +62,6 @@ class ResourceLoader:
         # If running from a PyInstaller bundle
         if getattr(sys, 'frozen', False):
             self.add_resource_dir(os.path.join(sys._MEIPASS, 'resources'))
-        
-        self._initialized = True
     
     def add_resource_dir(self, path: Union[str, Path]) -> bool:
         """Add a directory to search for resources.
@@ -58,6 +76,10 @@ class ResourceLoader:
             path = Path(path).resolve()
             if path.is_dir() and path not in self._resource_dirs:
                 self._resource_dirs.append(path)
+                # The new directory may hold resources that were not found before
+                self._resource_path_cache.clear()
+                get_font_family.cache_clear()
+                get_style_sheet.cache_clear()
                 logger.debug(f"Added resource directory: {path}")
                 return True
         except Exception as e:
@@ -76,13 +98,18 @@ class ResourceLoader:
         resource_path = resource_path.replace('\\', '/')
         
         # Check cache first
+        if resource_path in self._resource_path_cache:
+            return self._resource_path_cache[resource_path]
+        
         for base_dir in self._resource_dirs:
             full_path = base_dir / resource_path
             if full_path.exists():
+                self._resource_path_cache[resource_path] = full_path
                 return full_path
         
         # Not found in any resource directory
         logger.warning(f"Resource not found: {resource_path}")
+        self._resource_path_cache[resource_path] = None
         return None
     
     def load_icon(self, icon_path: str, color: str = None, size: QSize = None) -> Optional[QIcon]:
@@ -110,11 +137,14 @@ class ResourceLoader:
         try:
             # Handle SVG icons
             if icon_file.suffix.lower() == '.svg':
-                renderer = QSvgRenderer(str(icon_file))
-                
-                if not renderer.isValid():
-                    logger.error(f"Invalid SVG file: {icon_file}")
-                    return None
+                # Parse each SVG once; only rasterizing depends on color and size
+                renderer = self._svg_renderer_cache.get(str(icon_file))
+                if renderer is None:
+                    renderer = QSvgRenderer(str(icon_file))
+                    if not renderer.isValid():
+                        logger.error(f"Invalid SVG file: {icon_file}")
+                        return None
+                    self._svg_renderer_cache[str(icon_file)] = renderer
                 
                 # Create a pixmap to render the SVG into
                 pixmap_size = size if size else QSize(32, 32)
@@ -128,13 +158,7 @@ class ResourceLoader:
                 
                 # Apply color if specified
                 if color:
-                    image = pixmap.toImage()
-                    for x in range(image.width()):
-                        for y in range(image.height()):
-                            pixel_color = image.pixelColor(x, y)
-                            if pixel_color.alpha() > 0:  # Only recolor non-transparent pixels
-                                image.setPixelColor(x, y, QColor(color))
-                    pixmap = QPixmap.fromImage(image)
+                    pixmap = _recolor(pixmap, color)
                 
                 icon = QIcon(pixmap)
             else:
@@ -143,17 +167,9 @@ class ResourceLoader:
                 
                 # Apply color if specified (only works well for monochrome icons)
                 if color:
-                    # Convert icon to image, apply color, and back to icon
+                    # Convert icon to a pixmap, apply color, and back to icon
                     pixmap = icon.pixmap(size if size else QSize(32, 32))
-                    image = pixmap.toImage()
-                    
-                    for x in range(image.width()):
-                        for y in range(image.height()):
-                            pixel_color = image.pixelColor(x, y)
-                            if pixel_color.alpha() > 0:  # Only recolor non-transparent pixels
-                                image.setPixelColor(x, y, QColor(color))
-                    
-                    icon = QIcon(QPixmap.fromImage(image))
+                    icon = QIcon(_recolor(pixmap, color))
             
             # Cache the result
             self._icon_cache[cache_key] = icon
@@ -185,11 +201,19 @@ class ResourceLoader:
             return None
         
         try:
-            # Load the pixmap
-            pixmap = QPixmap(str(image_file))
+            reader = QImageReader(str(image_file))
             
-            # Resize if needed
-            if size and not size.isNull() and not size.isEmpty():
+            # Resize if needed; the decoder scales while decoding, so a
+            # large source is never fully decoded just to be shrunk
+            resize = size and not size.isNull() and not size.isEmpty()
+            source_size = reader.size()
+            if resize and source_size.isValid():
+                reader.setScaledSize(source_size.scaled(size, Qt.KeepAspectRatio))
+            
+            # Load the pixmap
+            pixmap = QPixmap.fromImage(reader.read())
+            if resize and not source_size.isValid():
+                # Formats that cannot report their size up front
                 pixmap = pixmap.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             
             # Cache the result
@@ -200,14 +224,15 @@ class ResourceLoader:
             logger.error(f"Failed to load pixmap {image_path}: {e}", exc_info=True)
             return None
     
-    def load_font(self, font_path: str) -> bool:
-        """Load a font from the resource directories.
+    def _register_font(self, font_path: str) -> Optional[Dict[str, Any]]:
+        """Add a font to the application font database once.
         
         Args:
             font_path: Relative path to the font file.
             
         Returns:
-            bool: True if the font was loaded successfully, False otherwise.
+            Optional[Dict[str, Any]]: The font's database ID and families, or
+            None if it could not be loaded.
         """
         # Check cache
         if font_path in self._font_cache:
@@ -216,51 +241,49 @@ class ResourceLoader:
         # Find the font file
         font_file = self.find_resource(font_path)
         if not font_file:
-            return False
+            return None
         
+        entry = None
         try:
             # Load the font
             font_id = QFontDatabase.addApplicationFont(str(font_file))
             if font_id == -1:
                 logger.error(f"Failed to load font: {font_path}")
-                self._font_cache[font_path] = False
-                return False
-            
-            self._font_cache[font_path] = True
-            logger.debug(f"Loaded font: {font_path}")
-            return True
-            
+            else:
+                entry = {'id': font_id, 'families': QFontDatabase.applicationFontFamilies(font_id)}
+                logger.debug(f"Loaded font: {font_path}")
         except Exception as e:
             logger.error(f"Error loading font {font_path}: {e}", exc_info=True)
-            self._font_cache[font_path] = False
-            return False
+        
+        self._font_cache[font_path] = entry
+        return entry
+    
+    def load_font(self, font_path: str) -> bool:
+        """Load a font from the resource directories.
+        
+        Args:
+            font_path: Relative path to the font file.
+            
+        Returns:
+            bool: True if the font was loaded successfully, False otherwise.
+        """
+        return self._register_font(font_path) is not None
     
     def get_font_family(self, font_path: str) -> Optional[str]:
         """Get the font family name from a font file.
         
+        The font is registered with Qt on first use and reused afterwards.
+        
         Args:
             font_path: Relative path to the font file.
             
         Returns:
             Optional[str]: The font family name, or None if not found.
         """
-        # Find the font file
-        font_file = self.find_resource(font_path)
-        if not font_file:
-            return None
-        
-        try:
-            # Load the font and get its family
-            font_id = QFontDatabase.addApplicationFont(str(font_file))
-            if font_id == -1:
-                return None
-                
-            families = QFontDatabase.applicationFontFamilies(font_id)
-            return families[0] if families else None
-            
-        except Exception as e:
-            logger.error(f"Error getting font family for {font_path}: {e}", exc_info=True)
+        entry = self._register_font(font_path)
+        if entry is None or not entry['families']:
             return None
+        return entry['families'][0]
     
     def get_style_sheet(self, style_sheet_path: str) -> str:
         """Load a style sheet from the resource directories.
@@ -283,9 +306,6 @@ class ResourceLoader:
             logger.error(f"Failed to load style sheet {style_sheet_path}: {e}", exc_info=True)
             return ""
 
-# Singleton instance
-resource_loader = ResourceLoader()
-
 def load_icon(icon_path: str, color: str = None, size: QSize = None) -> Optional[QIcon]:
     """Load an icon from the resource directories.
     
@@ -322,9 +342,12 @@ def load_font(font_path: str) -> bool:
     """
     return resource_loader.load_font(font_path)
 
+@lru_cache(maxsize=256)
 def get_font_family(font_path: str) -> Optional[str]:
     """Get the font family name from a font file.
     
+    Results are memoized until a resource directory is added.
+    
     Args:
         font_path: Relative path to the font file.
         
@@ -333,9 +356,12 @@ def get_font_family(font_path: str) -> Optional[str]:
     """
     return resource_loader.get_font_family(font_path)
 
+@lru_cache(maxsize=256)
 def get_style_sheet(style_sheet_path: str) -> str:
     """Load a style sheet from the resource directories.
     
+    Results are memoized until a resource directory is added.
+    
     Args:
         style_sheet_path: Relative path to the style sheet file.
         
@@ -343,3 +369,6 @@ def get_style_sheet(style_sheet_path: str) -> str:
         str: The loaded style sheet, or an empty string if not found.
     """
     return resource_loader.get_style_sheet(style_sheet_path)
+
+# Shared instance; created last because add_resource_dir clears the memoized helpers above
+resource_loader = ResourceLoader()
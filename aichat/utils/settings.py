@@ -4,13 +4,67 @@ Settings management for the application.
 import json
 import logging
 import os
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional, Union
 
-from PyQt5.QtCore import QSettings, QStandardPaths
+from PyQt5.QtCore import QSettings, QStandardPaths, QTimer
 
 logger = logging.getLogger(__name__)
 
+# Marks a key that has no default
+_MISSING = object()
+
+
+def _flatten(tree: Dict[str, Any]) -> Dict[str, Any]:
+    """Map every dotted key path in a nested dict to its value.
+    
+    Intermediate sections are included, so 'app' maps to the whole section.
+    
+    Args:
+        tree: Nested dictionary of settings
+        
+    Returns:
+        Dictionary keyed by dotted paths such as 'app.theme'
+    """
+    flat = {}
+    stack = [("", tree)]
+    while stack:
+        prefix, node = stack.pop()
+        for k, v in node.items():
+            path = f"{prefix}.{k}" if prefix else k
+            flat[path] = v
+            if isinstance(v, dict):
+                stack.append((path, v))
+    return flat
+
+
+@lru_cache(maxsize=256)
+def _coerce(value: str) -> Any:
+    """Convert a string read back from QSettings to a bool, int or float.
+    
+    Args:
+        value: The stored string
+        
+    Returns:
+        The converted value, or the string itself if it is none of those
+    """
+    if value.lower() == 'true':
+        return True
+    elif value.lower() == 'false':
+        return False
+    
+    # Try to convert to int or float if possible
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return value
+
+
 class SettingsManager:
     """Manages application settings with persistence."""
     
@@ -25,6 +79,8 @@ class SettingsManager:
         self.org_name = org_name
         self.settings = QSettings(org_name, app_name)
         self.defaults = self._get_default_settings()
+        # Every dotted key in the defaults, so lookups need no tree walk
+        self._flat_defaults = _flatten(self.defaults)
         
         # Create config directory if it doesn't exist
         self.config_dir = Path(QStandardPaths.writableLocation(QStandardPaths.AppConfigLocation))
@@ -32,6 +88,17 @@ class SettingsManager:
         
         # Migrate old settings if needed
         self._migrate_old_settings()
+        
+        # Stored values, read once; set() writes through to QSettings
+        self._cache: Dict[str, Any] = {k: self.settings.value(k) for k in self.settings.allKeys()}
+        
+        # Writes are flushed to storage once things go quiet, or when the
+        # outermost batch() ends
+        self._batch_depth = 0
+        self._sync_timer = QTimer()
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(500)
+        self._sync_timer.timeout.connect(self.sync)
     
     def _get_default_settings(self) -> Dict[str, Any]:
         """Get default settings.
@@ -136,35 +203,16 @@ class SettingsManager:
             The setting value or default if not found
         """
         # Try to get from settings first
-        value = self.settings.value(key)
+        value = self._cache.get(key)
         
         # If not found, try to get from defaults
         if value is None:
-            keys = key.split('.')
-            current = self.defaults
-            
-            try:
-                for k in keys:
-                    current = current[k]
-                return current
-            except (KeyError, TypeError):
-                return default
-        
-        # Convert string booleans to actual booleans
+            value = self._flat_defaults.get(key, _MISSING)
+            return default if value is _MISSING else value
+        
+        # Convert string booleans and numbers to actual values
         if isinstance(value, str):
-            if value.lower() == 'true':
-                return True
-            elif value.lower() == 'false':
-                return False
-            
-            # Try to convert to int or float if possible
-            try:
-                return int(value)
-            except (ValueError, TypeError):
-                try:
-                    return float(value)
-                except (ValueError, TypeError):
-                    pass
+            return _coerce(value)
         
         return value
     
@@ -175,11 +223,34 @@ class SettingsManager:
             key: Setting key in dot notation (e.g., 'app.theme')
             value: Value to set
         """
+        self._cache[key] = value
         self.settings.setValue(key, value)
+        if self._batch_depth == 0:
+            self._sync_timer.start()
+    
+    @contextmanager
+    def batch(self):
+        """Group several set() calls into a single write to storage.
+        
+        Batches may be nested; storage is synced when the outermost one ends.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.sync()
+    
+    def sync(self):
+        """Write pending changes to permanent storage now."""
+        self._sync_timer.stop()
+        self.settings.sync()
     
     def reset_to_defaults(self):
         """Reset all settings to their default values."""
         self.settings.clear()
+        self._cache.clear()
     
     def save_window_state(self, window):
         """Save window geometry and state.
@@ -188,8 +259,9 @@ class SettingsManager:
             window: QMainWindow instance to save state from
         """
         if self.get("app.save_window_state", True):
-            self.set("app.window_geometry", window.saveGeometry())
-            self.set("app.window_state", window.saveState())
+            with self.batch():
+                self.set("app.window_geometry", window.saveGeometry())
+                self.set("app.window_state", window.saveState())
     
     def restore_window_state(self, window):
         """Restore window geometry and state.
@@ -1,5 +1,6 @@
 import sys
 import os
+import multiprocessing
 import requests
 import json
 from pathlib import Path
@@ -808,6 +809,8 @@ class FreeAIChatApp(QMainWindow):
         QMessageBox.information(self, "No AI Response", "There is no AI response to speak yet.")
 
 if __name__ == "__main__":
+    # Let PDF extraction workers start in the frozen Windows build
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     font = QFont("Segoe UI", 10)
@@ -4,7 +4,7 @@ import base64
 import io
 import json
 import time
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Union
 from pathlib import Path
 import requests
 from gtts import gTTS
@@ -161,6 +161,15 @@ class MultiModalProcessor:
         except Exception as e:
             return f"Error converting text to speech: {str(e)}"
 
+    def text_to_speech_bytes(self, text: str, lang: str = 'en') -> Union[bytes, str]:
+        """Convert text to speech using gTTS and return the MP3 data in memory."""
+        try:
+            buffer = io.BytesIO()
+            gTTS(text=text, lang=lang).write_to_fp(buffer)
+            return buffer.getvalue()
+        except Exception as e:
+            return f"Error converting text to speech: {str(e)}"
+
     def speech_to_text(self, audio_path: str, language: str = 'en-US') -> str:
         """Convert speech to text using speech recognition."""
         try:
@@ -170,6 +179,28 @@ class MultiModalProcessor:
         except Exception as e:
             return f"Error converting speech to text: {str(e)}"
 
+    def speech_to_text_bytes(self, audio: Union[bytes, io.BytesIO, sr.AudioData],
+                             language: str = 'en-US') -> str:
+        """Convert in-memory speech to text without touching the disk.
+
+        Args:
+            audio: Captured ``sr.AudioData``, or WAV data as bytes or a
+                binary buffer.
+            language: Language code for recognition.
+
+        Returns:
+            The recognized text, or an error message.
+        """
+        try:
+            if not isinstance(audio, sr.AudioData):
+                if isinstance(audio, bytes):
+                    audio = io.BytesIO(audio)
+                with sr.AudioFile(audio) as source:
+                    audio = self.recognizer.record(source)
+            return self.recognizer.recognize_google(audio, language=language)
+        except Exception as e:
+            return f"Error converting speech to text: {str(e)}"
+
     def analyze_file(self, file_path: str) -> Dict[str, Any]:
         """Analyze various file types (PDF, Excel, CSV) with enhanced processing."""
         if not os.path.exists(file_path):
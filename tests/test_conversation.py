@@ -0,0 +1,156 @@
+"""
+Tests for conversation persistence.
+"""
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from aichat.utils import conversation
+from aichat.utils.conversation import ConversationManager
+
+
+class TestConversationManager(unittest.TestCase):
+    """Test cases for the ConversationManager class."""
+    
+    def setUp(self):
+        """Create a manager backed by a temporary directory."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="test_conversations_"))
+        self.manager = ConversationManager(save_dir=str(self.test_dir))
+        self.messages = [
+            {'role': 'user', 'content': 'سلام! How do I say hello in Pashto?'},
+            {'role': 'assistant', 'content': 'You can say "سلام".'},
+        ]
+    
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.manager.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def test_save_and_load_round_trip(self):
+        """Test that a saved conversation loads back unchanged."""
+        conversation_id = self.manager.save_conversation(self.messages, title="Greetings")
+        
+        data = self.manager.load_conversation(conversation_id)
+        self.assertEqual(data['id'], conversation_id)
+        self.assertEqual(data['title'], "Greetings")
+        self.assertEqual(data['messages'], self.messages)
+    
+    def test_title_generated_from_first_user_message(self):
+        """Test that the title defaults to the first user message."""
+        long_message = [{'role': 'user', 'content': 'x' * 80}]
+        conversation_id = self.manager.save_conversation(long_message)
+        
+        title = self.manager.load_conversation(conversation_id)['title']
+        self.assertEqual(title, 'x' * 50 + '...')
+        
+        conversation_id = self.manager.save_conversation([{'role': 'system', 'content': 'hi'}], "conv_empty")
+        self.assertEqual(self.manager.load_conversation(conversation_id)['title'], 'New Chat')
+    
+    def test_generated_ids_are_unique(self):
+        """Test that conversations saved back to back get distinct IDs."""
+        first = self.manager.save_conversation(self.messages)
+        second = self.manager.save_conversation(self.messages)
+        self.assertNotEqual(first, second)
+        self.assertEqual(len(self.manager.list_conversations()), 2)
+    
+    def test_list_conversations(self):
+        """Test that listing returns metadata for every saved conversation."""
+        self.manager.save_conversation(self.messages, "conv_a", "A")
+        self.manager.save_conversation(self.messages[:1], "conv_b", "B")
+        
+        listed = {c['id']: c for c in self.manager.list_conversations()}
+        self.assertEqual(set(listed), {"conv_a", "conv_b"})
+        self.assertEqual(listed["conv_a"]['message_count'], 2)
+        self.assertEqual(listed["conv_b"]['message_count'], 1)
+        self.assertEqual(listed["conv_b"]['title'], "B")
+    
+    def test_delete_conversation(self):
+        """Test that deleted conversations are no longer listed."""
+        self.manager.save_conversation(self.messages, "conv_a")
+        
+        self.assertTrue(self.manager.delete_conversation("conv_a"))
+        self.assertFalse(self.manager.delete_conversation("conv_a"))
+        self.assertEqual(self.manager.list_conversations(), [])
+
+    
+    def test_list_uses_index(self):
+        """Test that listing is served from the metadata index."""
+        self.manager.save_conversation(self.messages, "conv_a", "A")
+        self.assertTrue(self.manager.index_path.exists())
+        
+        # Metadata comes from the index, not from re-reading the file
+        self.manager.get_conversation_path("conv_a").write_text("not json", encoding='utf-8')
+        listed = self.manager.list_conversations()
+        self.assertEqual([c['id'] for c in listed], ["conv_a"])
+        self.assertEqual(listed[0]['message_count'], 2)
+    
+    def test_missing_index_is_rebuilt(self):
+        """Test that the index is rebuilt from the files when missing or corrupt."""
+        self.manager.save_conversation(self.messages, "conv_a", "A")
+        self.manager.save_conversation(self.messages, "conv_b", "B")
+        
+        self.manager.index_path.unlink()
+        self.assertEqual({c['id'] for c in self.manager.list_conversations()}, {"conv_a", "conv_b"})
+        self.assertTrue(self.manager.index_path.exists())
+        
+        self.manager.index_path.write_text("{broken", encoding='utf-8')
+        self.assertEqual(len(self.manager.list_conversations()), 2)
+    
+    def test_legacy_json_index_is_replaced(self):
+        """Test that a JSON index from earlier versions is not listed as a conversation."""
+        self.manager.save_conversation(self.messages, "conv_a", "A")
+        self.manager.close()
+        self.manager.index_path.unlink()
+        legacy_index = self.test_dir / "_index.json"
+        legacy_index.write_text('{"conv_a": {"id": "conv_a"}}', encoding='utf-8')
+        
+        self.assertEqual([c['id'] for c in self.manager.list_conversations()], ["conv_a"])
+        self.assertFalse(legacy_index.exists())
+
+    
+    def test_sync_index_picks_up_external_changes(self):
+        """Test that files added or removed behind the manager's back are synced."""
+        self.manager.save_conversation(self.messages, "conv_a", "A")
+        self.assertEqual(len(self.manager.list_conversations()), 1)
+        self.assertFalse(self.manager.sync_index())
+        
+        data = {'id': "conv_b", 'title': "B", 'updated_at': "2025-01-01T00:00:00", 'messages': []}
+        self.manager.get_conversation_path("conv_b").write_bytes(conversation._dumps(data))
+        self.manager.get_conversation_path("conv_a").unlink()
+        
+        # The cached listing is kept until the index is synced
+        self.assertEqual([c['id'] for c in self.manager.list_conversations()], ["conv_a"])
+        self.assertTrue(self.manager.sync_index())
+        self.assertEqual([c['id'] for c in self.manager.list_conversations()], ["conv_b"])
+    
+    def test_index_from_earlier_session_is_synced(self):
+        """Test that files changed while no manager was open show up in the list."""
+        self.manager.save_conversation(self.messages, "conv_a", "A")
+        self.manager.close()
+        
+        data = {'id': "conv_b", 'title': "B", 'updated_at': "2025-01-01T00:00:00", 'messages': []}
+        self.manager.get_conversation_path("conv_b").write_bytes(conversation._dumps(data))
+        self.manager.get_conversation_path("conv_a").unlink()
+        
+        fresh = ConversationManager(save_dir=str(self.test_dir))
+        try:
+            self.assertEqual([c['id'] for c in fresh.list_conversations()], ["conv_b"])
+        finally:
+            fresh.close()
+    
+    @unittest.skipUnless(conversation.HAS_IJSON, "ijson not installed")
+    def test_streamed_metadata_matches_full_parse(self):
+        """Test that streaming a file yields the same record as parsing it."""
+        messages = self.messages + [{'role': 'user', 'content': ['nested', {'x': 1}]}]
+        self.manager.save_conversation(messages, "conv_a", "A")
+        file_path = self.manager.get_conversation_path("conv_a")
+        
+        with open(file_path, 'rb') as f:
+            expected = ConversationManager._metadata(conversation._loads(f.read()), file_path)
+        self.assertEqual(self.manager._read_metadata(file_path), expected)
+        self.assertEqual(expected['message_count'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
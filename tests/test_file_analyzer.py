@@ -0,0 +1,201 @@
+"""
+Tests for file analysis.
+"""
+import csv
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from openpyxl import Workbook
+from PIL import Image
+
+from aichat.utils import file_analyzer
+from aichat.utils.file_analyzer import FileAnalyzer, _ResultCache, _sniff_image, _unique_headers
+
+
+class TestResultCache(unittest.TestCase):
+    """Test cases for the analysis result cache."""
+
+    def test_evicts_least_recently_used_by_size(self):
+        """Test that entries are evicted once their total size is over the limit."""
+        cache = _ResultCache(max_bytes=100)
+        cache.put(('a', 0, 40), {'size': 40, 'content': 'a'})
+        cache.put(('b', 0, 40), {'size': 40, 'content': 'b'})
+        self.assertIsNotNone(cache.get(('a', 0, 40)))
+
+        # 'b' is now the least recently used and makes room for 'c'
+        cache.put(('c', 0, 40), {'size': 40, 'content': 'c'})
+        self.assertIsNone(cache.get(('b', 0, 40)))
+        self.assertIsNotNone(cache.get(('a', 0, 40)))
+        self.assertIsNotNone(cache.get(('c', 0, 40)))
+
+    def test_oversized_and_contentless_results(self):
+        """Test that results over the limit are skipped and ones without content are free."""
+        cache = _ResultCache(max_bytes=100)
+        cache.put(('big', 0, 101), {'size': 101, 'content': 'x'})
+        self.assertIsNone(cache.get(('big', 0, 101)))
+
+        cache.put(('image', 0, 10**9), {'size': 10**9, 'content': None})
+        cache.put(('a', 0, 100), {'size': 100, 'content': 'a'})
+        self.assertIsNotNone(cache.get(('image', 0, 10**9)))
+        self.assertIsNotNone(cache.get(('a', 0, 100)))
+
+    def test_results_are_copies(self):
+        """Test that changing a result does not change the cached entry."""
+        cache = _ResultCache(max_bytes=100)
+        original = {'size': 10, 'content': {'data': [[1, 2]]}}
+        cache.put(('a', 0, 10), original)
+        original['content']['data'].append([3, 4])
+
+        result = cache.get(('a', 0, 10))
+        result['content']['data'][0].append(5)
+        self.assertEqual(cache.get(('a', 0, 10))['content'], {'data': [[1, 2]]})
+
+
+class TestFileAnalyzer(unittest.TestCase):
+    """Test cases for the FileAnalyzer class."""
+
+    def setUp(self):
+        """Create a temporary directory and start with an empty cache."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="test_file_analyzer_"))
+        FileAnalyzer.clear_cache()
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        FileAnalyzer.clear_cache()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, name: str, data: bytes) -> Path:
+        path = self.test_dir / name
+        path.write_bytes(data)
+        return path
+
+    def test_unchanged_file_is_analyzed_once(self):
+        """Test that a cached result is reused and isolated from the caller."""
+        path = self._write("data.json", b'{"items": [1, 2]}')
+        with mock.patch.object(FileAnalyzer, "_analyze", wraps=FileAnalyzer._analyze) as analyze:
+            first = FileAnalyzer.analyze_file(path)
+            first['content']['items'].append(3)
+            second = FileAnalyzer.analyze_file(path)
+
+        analyze.assert_called_once()
+        self.assertEqual(second['content'], {'items': [1, 2]})
+
+    def test_text_counts_match_text_mode_read(self):
+        """Test that line, word and character counts match reading in text mode."""
+        samples = [
+            b"",
+            b"one line",
+            b"two\nlines\n",
+            b"windows\r\nline endings\r\nno final newline",
+            b"old mac\rline endings\r",
+            b"mixed\r\n\rendings\n\n  spaced   words\t\there ",
+            "پښتو متن\nسلام\n".encode('utf-8'),
+        ]
+        for i, raw in enumerate(samples):
+            with self.subTest(raw=raw):
+                path = self._write(f"sample{i}.txt", raw)
+                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                    text = f.read()
+
+                result = FileAnalyzer.analyze_file(path)
+                self.assertEqual(result['content'], text)
+                self.assertEqual(result['line_count'], len(text.splitlines()))
+                self.assertEqual(result['word_count'], len(text.split()))
+                self.assertEqual(result['char_count'], len(text))
+
+    def test_csv_matches_csv_module(self):
+        """Test that CSV headers, rows and counts match the csv module."""
+        path = self._write("table.csv", b"name,city,age\nAhmad,Kabul,30\nZarmina,Kandahar,25\nGul,Herat,41\n")
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+
+        result = FileAnalyzer.analyze_file(path)
+        self.assertEqual(result['type'], 'csv')
+        self.assertEqual(result['content'], {'headers': rows[0], 'data': rows[1:]})
+        self.assertEqual(result['row_count'], 3)
+        self.assertEqual(result['column_count'], 3)
+
+    def test_csv_preview_is_limited(self):
+        """Test that only a preview of the rows is returned but all are counted."""
+        rows = "".join(f"{i},item {i}\n" for i in range(file_analyzer._PREVIEW_ROWS + 20))
+        path = self._write("long.csv", ("id,label\n" + rows).encode('utf-8'))
+
+        result = FileAnalyzer.analyze_file(path)
+        self.assertEqual(len(result['content']['data']), file_analyzer._PREVIEW_ROWS)
+        self.assertEqual(result['row_count'], file_analyzer._PREVIEW_ROWS + 20)
+
+    def test_csv_with_header_only(self):
+        """Test that a CSV without data rows is an empty table."""
+        path = self._write("header.csv", b"name,city,age\n")
+        result = FileAnalyzer.analyze_file(path)
+        self.assertEqual(result['type'], 'csv')
+        self.assertEqual(result['row_count'], 0)
+        self.assertEqual(result['column_count'], 3)
+
+    def test_unique_headers(self):
+        """Test that blank and repeated header cells get pandas-style names."""
+        self.assertEqual(
+            _unique_headers(('Name', 'Name', None, '', 'Name', 'Age')),
+            ['Name', 'Name.1', 'Unnamed: 2', 'Unnamed: 3', 'Name.2', 'Age'],
+        )
+        self.assertEqual(_unique_headers(('a', 'a.1', 'a')), ['a', 'a.1', 'a.2'])
+
+    def test_excel_keeps_repeated_and_blank_columns(self):
+        """Test that every Excel column survives repeated or blank headers."""
+        wb = Workbook()
+        ws = wb.active
+        ws.append(['Name', 'Name', None, 'Age'])
+        ws.append(['Ahmad', 'Khan', 'x', 30])
+        ws.append(['Gul', 'Zai', 'y', 41])
+        path = self.test_dir / "people.xlsx"
+        wb.save(path)
+
+        result = FileAnalyzer.analyze_file(path)
+        self.assertEqual(result['content']['headers'], ['Name', 'Name.1', 'Unnamed: 2', 'Age'])
+        self.assertEqual(result['content']['data'][0], {'Name': 'Ahmad', 'Name.1': 'Khan', 'Unnamed: 2': 'x', 'Age': 30})
+        self.assertEqual(result['row_count'], 2)
+        self.assertEqual(result['column_count'], 4)
+        self.assertTrue(all(len(row) == result['column_count'] for row in result['content']['data']))
+
+    def test_sniffed_images_match_pillow(self):
+        """Test that PNG and JPEG headers give the same details as Pillow."""
+        images = [
+            ("rgb.png", Image.new('RGB', (17, 9)), 'PNG'),
+            ("rgba.png", Image.new('RGBA', (3, 300)), 'PNG'),
+            ("gray.png", Image.new('L', (64, 2)), 'PNG'),
+            ("palette.png", Image.new('P', (5, 5)), 'PNG'),
+            ("rgb.jpg", Image.new('RGB', (640, 480)), 'JPEG'),
+            ("gray.jpg", Image.new('L', (31, 7)), 'JPEG'),
+            ("progressive.jpg", Image.new('RGB', (20, 10)), 'JPEG'),
+        ]
+        for name, image, image_format in images:
+            with self.subTest(name=name):
+                path = self.test_dir / name
+                image.save(path, image_format, progressive=name.startswith("progressive"))
+                with Image.open(path) as img:
+                    expected = (img.format, img.mode, img.width, img.height)
+                self.assertEqual(_sniff_image(path), expected)
+
+    def test_truncated_images_fall_back_to_pillow(self):
+        """Test that headers the sniffer cannot read are left to Pillow."""
+        png = self.test_dir / "full.png"
+        Image.new('RGB', (4, 4)).save(png)
+        jpeg = self.test_dir / "full.jpg"
+        Image.new('RGB', (4, 4)).save(jpeg)
+
+        truncated_png = self._write("cut.png", png.read_bytes()[:20])
+        truncated_jpeg = self._write("cut.jpg", jpeg.read_bytes()[:30])
+        not_image = self._write("fake.png", b"not an image at all")
+        for path in (truncated_png, truncated_jpeg, not_image):
+            with self.subTest(path=path.name):
+                self.assertIsNone(_sniff_image(path))
+                result = FileAnalyzer.analyze_file(path)
+                self.assertEqual(result['type'], 'file')
+                self.assertIn('error', result)
+
+
+if __name__ == '__main__':
+    unittest.main()
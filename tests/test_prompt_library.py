@@ -0,0 +1,128 @@
+"""
+Tests for the prompt library.
+"""
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from aichat.utils.prompt_library import PromptLibrary
+
+
+class TestPromptLibrary(unittest.TestCase):
+    """Test cases for the PromptLibrary class."""
+
+    def setUp(self):
+        """Create a library backed by a temporary file."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="test_prompts_"))
+        self.path = str(self.test_dir / "prompts.json")
+        self.library = PromptLibrary(self.path)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.library.flush()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_prompts_persist(self):
+        """Test that saved prompts load back in a new library."""
+        self.library.add_prompt("greet", "ستاسو نوم څه دی؟")
+        self.library.add_prompt("translate", "Translate to Pashto:")
+        self.library.flush()
+
+        reloaded = PromptLibrary(self.path)
+        self.assertEqual(reloaded.get_prompts(), [
+            {"name": "greet", "text": "ستاسو نوم څه دی؟"},
+            {"name": "translate", "text": "Translate to Pashto:"},
+        ])
+
+    def test_edit_prompts(self):
+        """Test renaming, updating and deleting prompts."""
+        self.library.add_prompt("a", "first")
+        self.library.add_prompt("b", "second")
+
+        self.library.rename_prompt("a", "c")
+        self.library.update_prompt("c", "changed")
+        self.library.delete_prompt("b")
+        self.library.flush()
+
+        self.assertEqual(self.library.get_prompt("c"), {"name": "c", "text": "changed"})
+        self.assertIsNone(self.library.get_prompt("a"))
+        self.assertEqual(PromptLibrary(self.path).get_prompts(), [{"name": "c", "text": "changed"}])
+
+    def test_edits_are_saved_together(self):
+        """Test that a burst of edits is written once, after the save delay."""
+        with mock.patch.object(PromptLibrary, "_save_prompts", autospec=True) as save:
+            self.library.add_prompt("a", "first")
+            self.library.add_prompt("b", "second")
+            self.library.update_prompt("a", "changed")
+            save.assert_not_called()
+
+            self.library.flush()
+            save.assert_called_once_with(self.library)
+            self.library.flush()
+            save.assert_called_once_with(self.library)
+
+    def test_save_replaces_file_atomically(self):
+        """Test that saving leaves no temporary file behind."""
+        self.library.add_prompt("a", "first")
+        self.library.flush()
+        self.assertEqual([p.name for p in self.test_dir.iterdir()], ["prompts.json"])
+
+    def test_add_existing_name_replaces_text(self):
+        """Test that names stay unique when a prompt is added twice."""
+        self.library.add_prompt("a", "first")
+        self.library.add_prompt("a", "second")
+        self.assertEqual(self.library.get_prompts(), [{"name": "a", "text": "second"}])
+
+    def test_rename_to_taken_name_is_refused(self):
+        """Test that renaming onto another prompt's name keeps both prompts."""
+        self.library.add_prompt("a", "first")
+        self.library.add_prompt("b", "second")
+        self.assertFalse(self.library.rename_prompt("a", "b"))
+        self.assertFalse(self.library.rename_prompt("missing", "c"))
+        self.assertEqual(self.library.get_prompts(), [
+            {"name": "a", "text": "first"},
+            {"name": "b", "text": "second"},
+        ])
+        self.assertTrue(self.library.rename_prompt("a", "c"))
+        self.assertEqual(self.library.get_prompt("c"), {"name": "c", "text": "first"})
+
+    def test_duplicate_names_on_disk_are_kept(self):
+        """Test that duplicate names in the file survive loading and saving."""
+        Path(self.path).write_text(
+            '[{"name": "a", "text": "first"}, {"name": "a", "text": "second"}]', encoding="utf-8"
+        )
+        library = PromptLibrary(self.path)
+        self.assertEqual(library.get_prompt("a"), {"name": "a", "text": "first"})
+        library.add_prompt("b", "third")
+        library.flush()
+        self.assertEqual(len(PromptLibrary(self.path).get_prompts()), 3)
+
+        # Renaming the first copy exposes the second under the old name
+        self.assertTrue(library.rename_prompt("a", "c"))
+        self.assertEqual(library.get_prompt("a"), {"name": "a", "text": "second"})
+        library.flush()
+
+    def test_failed_background_save_is_retried(self):
+        """Test that a failed debounced save is logged and kept pending."""
+        # A directory in the way makes the final rename fail
+        Path(self.path).mkdir()
+        self.library.add_prompt("a", "first")
+        with self.assertLogs("aichat.utils.prompt_library", level="ERROR"):
+            self.library._save_timer.join()
+        with self.assertRaises(OSError):
+            self.library.flush()
+
+        Path(self.path).rmdir()
+        self.library.flush()
+        self.assertEqual(PromptLibrary(self.path).get_prompts(), [{"name": "a", "text": "first"}])
+
+    def test_unreadable_file_gives_empty_library(self):
+        """Test that a corrupt prompt file is treated as empty."""
+        Path(self.path).write_text("{broken", encoding="utf-8")
+        self.assertEqual(PromptLibrary(self.path).get_prompts(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+"""
+Tests for stylesheet generation.
+"""
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from aichat.ui.styles import _minify, generate_stylesheet
+from aichat.ui.theme_manager import ThemeManager
+
+
+def test_minify_strips_comments_and_whitespace():
+    """Test that comments and indentation are removed."""
+    qss = """
+    /* Buttons */
+    QPushButton , QToolButton {
+        padding: 3px 6px;
+    }
+    .A .B { color: red; }
+    """
+    assert _minify(qss) == "QPushButton,QToolButton{padding:3px 6px;}.A .B{color:red;}"
+
+
+def test_minify_keeps_resource_urls():
+    """Test that resource URLs survive minification."""
+    assert _minify("X { image: url(:/icons/a.png); }") == "X{image:url(:/icons/a.png);}"
+
+
+def test_generate_stylesheet_substitutes_theme_values():
+    """Test that every placeholder is filled from the theme."""
+    theme = ThemeManager.DARK_THEME
+    stylesheet = generate_stylesheet(theme)
+
+    assert "$" not in stylesheet
+    assert "/*" not in stylesheet
+    assert f"background-color:{theme['colors']['window']};" in stylesheet
+    assert f"padding:{theme['sizes']['padding'] / 2}px {theme['sizes']['padding']}px;" in stylesheet